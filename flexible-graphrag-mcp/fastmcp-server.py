@@ -14,7 +14,8 @@ from typing import List, Dict, Any, Optional
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'flexible-graphrag'))
 
 from fastmcp import FastMCP
-from backend import get_backend
+from config import get_settings
+from backend import get_backend, enable_nested_loops, configure_event_loop
 
 # Configure logging
 logging.basicConfig(
@@ -84,6 +85,22 @@ async def query_documents(query: str, top_k: int = 10) -> Dict[str, Any]:
         logger.error(f"Error in query_documents: {e}")
         return {"success": False, "error": str(e)}
 
+@mcp.tool()
+async def search_and_answer(query: str, top_k: int = 10) -> Dict[str, Any]:
+    """
+    Search documents and answer the query in one call (single retrieval pass)
+    
+    Args:
+        query: Question to ask
+        top_k: Number of results to return and use for the answer
+    """
+    try:
+        backend = get_backend()
+        return await backend.search_and_answer(query=query, top_k=top_k)
+    except Exception as e:
+        logger.error(f"Error in search_and_answer: {e}")
+        return {"success": False, "error": str(e)}
+
 @mcp.tool()
 async def ingest_text(content: str, source_name: str = "mcp-input") -> Dict[str, Any]:
     """
@@ -100,6 +117,16 @@ async def ingest_text(content: str, source_name: str = "mcp-input") -> Dict[str,
         logger.error(f"Error in ingest_text: {e}")
         return {"success": False, "error": str(e)}
 
+@mcp.tool()
+def clear_cache() -> Dict[str, Any]:
+    """Clear cached search and query results"""
+    try:
+        backend = get_backend()
+        return backend.clear_cache()
+    except Exception as e:
+        logger.error(f"Error in clear_cache: {e}")
+        return {"success": False, "error": str(e)}
+
 @mcp.tool()
 def get_config() -> Dict[str, Any]:
     """Get current system configuration"""
@@ -120,12 +147,18 @@ def health_check() -> Dict[str, Any]:
         logger.error(f"Error in health_check: {e}")
         return {"success": False, "error": str(e)}
 
+async def main():
+    """Warm the shared backend, then serve MCP requests"""
+    # Build the hybrid search system off the event loop so the first tool call hits a hot system
+    logger.info("Warming up hybrid search system...")
+    backend = get_backend()
+    if await asyncio.to_thread(backend.warmup):
+        logger.info("Hybrid search system ready")
+    
+    await mcp.run_async()
+
 if __name__ == "__main__":
     try:
-        # Apply nest_asyncio to handle nested event loops
-        import nest_asyncio
-        nest_asyncio.apply()
-        
         # Log startup info
         logger.info("🚀 Starting Standalone Flexible GraphRAG MCP Server")
         logger.info("🛠️  Available tools:")
@@ -133,14 +166,22 @@ if __name__ == "__main__":
         logger.info("   • ingest_documents - Ingest documents from various sources")
         logger.info("   • search_documents - Hybrid search for document retrieval") 
         logger.info("   • query_documents - AI-generated answers from documents")
+        logger.info("   • search_and_answer - Search results and answer from one retrieval")
         logger.info("   • ingest_text - Ingest raw text content")
+        logger.info("   • clear_cache - Clear cached search/query results")
         logger.info("   • get_config - Get current configuration")
         logger.info("   • health_check - System health check")
         logger.info("")
         logger.info("📡 This MCP server uses the shared backend directly (no HTTP overhead)")
         
+        # Pick the event loop (uvloop or stdlib) before it is created
+        configure_event_loop()
+        if get_settings().allow_nested_loops:
+            # Allow nested event loops (opt-in, stdlib loop only)
+            enable_nested_loops()
+        
         # Run the server directly
-        asyncio.run(mcp.run())
+        asyncio.run(main())
         
     except KeyboardInterrupt:
         logger.info("MCP server stopped by user")
@@ -8,7 +8,8 @@ import asyncio
 import os
 import sys
 import httpx
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import List, Dict, Any, Optional, Tuple, Union
 from fastmcp import FastMCP
 
 # Windows encoding is handled by environment variables in Claude Desktop config:
@@ -23,54 +24,109 @@ BACKEND_URL = os.getenv("FLEXIBLE_GRAPHRAG_URL", "http://localhost:8000")
 # Initialize MCP server
 mcp = FastMCP("flexible-graphrag-mcp")
 
-async def make_api_call(method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
-    """Make HTTP API call to the flexible-graphrag backend"""
-    async with httpx.AsyncClient() as client:
-        url = f"{BACKEND_URL}{endpoint}"
-        
-        if method.upper() == "GET":
-            response = await client.get(url)
-        elif method.upper() == "POST":
-            response = await client.post(url, json=data or {})
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+# Shared HTTP client - reused across tool calls so the connection pool stays warm
+_client: Optional[httpx.AsyncClient] = None
+
+async def get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        # HTTP/2 is negotiated over TLS when the backend supports it - plain http:// stays on HTTP/1.1
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+            http2=True
+        )
+    return _client
+
+async def close_client():
+    """Close the shared HTTP client on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# Last (etag, body) seen per endpoint for conditional GETs
+_etag_cache: Dict[str, Tuple[str, Any]] = {}
+MAX_ETAG_ENTRIES = 256
+
+# Upper bound on a single backend response body (search results with large chunks)
+MAX_RESPONSE_BYTES = int(os.getenv("FLEXIBLE_GRAPHRAG_MAX_RESPONSE_BYTES", str(64 * 1024 * 1024)))
+
+async def make_api_call(method: str, endpoint: str, data: Optional[Dict] = None, conditional: bool = False) -> Dict[str, Any]:
+    """Make HTTP API call to the flexible-graphrag backend
+    
+    With conditional=True the last ETag for the endpoint is sent as If-None-Match,
+    and a 304 Not Modified reply returns the cached body.
+    """
+    method = method.upper()
+    if method not in ("GET", "POST"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+    
+    client = await get_client()
+    url = f"{BACKEND_URL}{endpoint}"
+    cached = _etag_cache.get(endpoint) if conditional else None
+    headers = {"If-None-Match": cached[0]} if cached else None
+    
+    # Stream the body so large search results are read incrementally and capped in size
+    async with client.stream(method, url, json=(data or {}) if method == "POST" else None, headers=headers) as response:
+        if cached and response.status_code == 304:
+            return cached[1]
         
         response.raise_for_status()
-        return response.json()
+        content = bytearray()
+        async for chunk in response.aiter_bytes():
+            content += chunk
+            if len(content) > MAX_RESPONSE_BYTES:
+                raise ValueError(f"Backend response from {endpoint} exceeds {MAX_RESPONSE_BYTES} bytes")
+        etag = response.headers.get("ETag")
+    
+    body = orjson.loads(content)
+    if conditional and etag:
+        if endpoint not in _etag_cache and len(_etag_cache) >= MAX_ETAG_ENTRIES:
+            _etag_cache.pop(next(iter(_etag_cache)))
+        _etag_cache[endpoint] = (etag, body)
+    return body
 
-@mcp.tool()
-async def get_system_status() -> Dict[str, Any]:
-    """Get the current status of the flexible-graphrag system"""
+async def _dispatch(method: str, endpoint: str, data: Optional[Dict] = None, result_key: str = "data",
+                    conditional: bool = False) -> Dict[str, Any]:
+    """Call the backend and wrap the result in the standard tool response"""
     try:
-        result = await make_api_call("GET", "/api/status")
-        return {"success": True, "data": result}
+        result = await make_api_call(method, endpoint, data, conditional=conditional)
+        return {"success": True, result_key: result}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+# Tools that pass straight through to a backend endpoint: (name, method, endpoint, description)
+PASSTHROUGH_TOOLS = [
+    ("get_system_status", "GET", "/api/status", "Get the current status of the flexible-graphrag system"),
+    ("test_with_sample", "POST", "/api/test-sample", "Test the system with sample text for quick verification"),
+    ("clear_cache", "POST", "/api/clear-cache", "Clear cached search and query results on the backend"),
+    ("get_python_info", "GET", "/api/python-info", "Get information about the Python environment of the backend"),
+    ("health_check", "GET", "/api/health", "Check if the backend is healthy and responsive"),
+]
+
+def _make_passthrough_tool(method: str, endpoint: str):
+    async def tool() -> Dict[str, Any]:
+        return await _dispatch(method, endpoint)
+    return tool
+
+for _name, _method, _endpoint, _description in PASSTHROUGH_TOOLS:
+    mcp.tool(name=_name, description=_description)(_make_passthrough_tool(_method, _endpoint))
+
 @mcp.tool()
-async def ingest_documents(data_source: str = "filesystem", paths: str = None) -> Dict[str, Any]:
+async def ingest_documents(data_source: str = "filesystem", paths: Optional[Union[List[str], str]] = None) -> Dict[str, Any]:
     """
     Ingest documents from a data source
     
     Args:
         data_source: Type of data source (filesystem, cmis, alfresco)  
-        paths: Single file path or JSON array of paths (for filesystem source)
+        paths: List of file/folder paths, or a single path (for filesystem source)
     """
     try:
         request_data = {"data_source": data_source}
         if paths:
-            # Handle both single path string and JSON array string
-            import json
-            try:
-                # Try to parse as JSON array first
-                parsed_paths = json.loads(paths)
-                if isinstance(parsed_paths, list):
-                    request_data["paths"] = parsed_paths
-                else:
-                    request_data["paths"] = [str(parsed_paths)]
-            except json.JSONDecodeError:
-                # If JSON parsing fails, treat as single path
-                request_data["paths"] = [paths]
+            request_data["paths"] = paths if isinstance(paths, list) else [paths]
             
         result = await make_api_call("POST", "/api/ingest", request_data)
         return result  # Return the async processing response directly
@@ -91,12 +147,7 @@ async def search_documents(query: str, top_k: int = 10) -> Dict[str, Any]:
         query: Search query string
         top_k: Number of results to return
     """
-    try:
-        request_data = {"query": query, "top_k": top_k}
-        result = await make_api_call("POST", "/api/search", request_data)
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    return await _dispatch("POST", "/api/search", {"query": query, "top_k": top_k})
 
 @mcp.tool()
 async def query_documents(query: str, top_k: int = 10) -> Dict[str, Any]:
@@ -107,21 +158,18 @@ async def query_documents(query: str, top_k: int = 10) -> Dict[str, Any]:
         query: Question to ask
         top_k: Number of source documents to consider
     """
-    try:
-        request_data = {"query": query, "top_k": top_k}
-        result = await make_api_call("POST", "/api/query", request_data)
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    return await _dispatch("POST", "/api/query", {"query": query, "top_k": top_k})
 
 @mcp.tool()
-async def test_with_sample() -> Dict[str, Any]:
-    """Test the system with sample text for quick verification"""
-    try:
-        result = await make_api_call("POST", "/api/test-sample")
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+async def search_and_answer(query: str, top_k: int = 10) -> Dict[str, Any]:
+    """
+    Search documents and answer the query in one call (single retrieval pass)
+    
+    Args:
+        query: Question to ask
+        top_k: Number of results to return and use for the answer
+    """
+    return await _dispatch("POST", "/api/search-and-answer", {"query": query, "top_k": top_k})
 
 @mcp.tool()
 async def ingest_text(content: str, source_name: str = "mcp-input") -> Dict[str, Any]:
@@ -132,12 +180,7 @@ async def ingest_text(content: str, source_name: str = "mcp-input") -> Dict[str,
         content: Text content to ingest
         source_name: Name/identifier for this text source
     """
-    try:
-        request_data = {"content": content, "source_name": source_name}
-        result = await make_api_call("POST", "/api/ingest-text", request_data)
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    return await _dispatch("POST", "/api/ingest-text", {"content": content, "source_name": source_name})
 
 @mcp.tool()
 async def check_processing_status(processing_id: str) -> Dict[str, Any]:
@@ -147,29 +190,22 @@ async def check_processing_status(processing_id: str) -> Dict[str, Any]:
     Args:
         processing_id: The processing ID returned from ingest_text
     """
-    try:
-        result = await make_api_call("GET", f"/api/processing-status/{processing_id}")
-        return {"success": True, "processing": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    return await _dispatch("GET", f"/api/processing-status/{processing_id}", result_key="processing", conditional=True)
 
-@mcp.tool()
-async def get_python_info() -> Dict[str, Any]:
-    """Get information about the Python environment of the backend"""
-    try:
-        result = await make_api_call("GET", "/api/python-info")
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+TOOL_NAMES = [
+    "get_system_status", "ingest_documents", "search_documents", "query_documents",
+    "search_and_answer", "test_with_sample", "ingest_text", "check_processing_status", "clear_cache",
+    "get_python_info", "health_check"
+]
 
-@mcp.tool()
-async def health_check() -> Dict[str, Any]:
-    """Check if the backend is healthy and responsive"""
+def use_uvloop() -> bool:
+    """Switch asyncio to uvloop if installed (not available on Windows)"""
     try:
-        result = await make_api_call("GET", "/api/health")
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
 
 def main():
     """Run the MCP server"""
@@ -216,31 +252,25 @@ def main():
         sys.stderr.write("📱 Running in stdio mode for Claude Desktop\n")
     
     sys.stderr.write("🛠️  Available tools:\n")
-    sys.stderr.write("   • get_system_status\n")
-    sys.stderr.write("   • ingest_documents\n")
-    sys.stderr.write("   • search_documents\n") 
-    sys.stderr.write("   • query_documents\n")
-    sys.stderr.write("   • test_with_sample\n")
-    sys.stderr.write("   • ingest_text\n")
-    sys.stderr.write("   • check_processing_status\n")
-    sys.stderr.write("   • get_python_info\n")
-    sys.stderr.write("   • health_check\n")
+    for tool_name in TOOL_NAMES:
+        sys.stderr.write(f"   • {tool_name}\n")
     sys.stderr.flush()
     
-    # Run the MCP server
-    try:
-        # Apply nest_asyncio to handle nested event loops
-        import nest_asyncio
-        nest_asyncio.apply()
-    except ImportError:
-        pass
+    # Run the MCP server on uvloop when available (faster event loop for network I/O)
+    use_uvloop()
+    
+    async def serve(server_coro):
+        try:
+            await server_coro
+        finally:
+            await close_client()
     
     if http_mode:
         # Run HTTP server for MCP Inspector
-        asyncio.run(mcp.run_http_async(host=host, port=port))
+        asyncio.run(serve(mcp.run_http_async(host=host, port=port)))
     else:
         # Run stdio server for Claude Desktop
-        asyncio.run(mcp.run_async())
+        asyncio.run(serve(mcp.run_async()))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
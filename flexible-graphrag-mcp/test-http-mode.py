@@ -5,10 +5,28 @@ Test script to verify HTTP mode functionality for MCP Inspector
 
 import sys
 import time
+import asyncio
 import subprocess
-import requests
+import httpx
 from pathlib import Path
 
+async def wait_ready(url: str, proc: subprocess.Popen, deadline: float = 5.0) -> bool:
+    """Poll url with exponential backoff until the server answers or the deadline expires"""
+    start = time.monotonic()
+    delay = 0.05
+    async with httpx.AsyncClient(timeout=0.5) as client:
+        while time.monotonic() - start < deadline:
+            if proc.poll() is not None:
+                return False  # Server process exited during startup
+            try:
+                await client.get(url)
+                return True  # Any HTTP response means the server is accepting requests
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    return False
+
 def test_http_mode():
     """Test the HTTP mode of the MCP server"""
     print("🧪 Testing HTTP Mode for MCP Inspector")
@@ -16,9 +34,9 @@ def test_http_mode():
     
     # Check if backend is running
     try:
-        response = requests.get("http://localhost:8000/api/health", timeout=5)
+        response = httpx.get("http://localhost:8000/api/health", timeout=5.0)
         print("✅ Backend server is running")
-    except requests.exceptions.RequestException:
+    except httpx.HTTPError:
         print("❌ Backend server not running. Please start it first:")
         print("   cd ../flexible-graphrag && python main.py")
         return False
@@ -32,11 +50,10 @@ def test_http_mode():
             sys.executable, "main.py", "--http", "--port", "3001"
         ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         
-        # Give it a moment to start
-        time.sleep(3)
+        # Wait until the server accepts connections instead of sleeping a fixed time
+        ready = asyncio.run(wait_ready("http://localhost:3001", proc))
         
-        # Check if process is still running (good sign)
-        if proc.poll() is None:
+        if ready and proc.poll() is None:
             print("✅ HTTP mode server started successfully")
             
             # Try to terminate gracefully
@@ -48,7 +65,9 @@ def test_http_mode():
             
             return True
         else:
-            # Process exited, check for errors
+            # Process exited or never became ready, check for errors
+            if proc.poll() is None:
+                proc.kill()
             stdout, stderr = proc.communicate()
             print("❌ HTTP mode failed to start")
             if stderr:
@@ -4,41 +4,176 @@ This module contains the business logic that can be called by both FastAPI and F
 """
 
 import logging
-import uuid
+import secrets
 import asyncio
 import sys
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, Union, Optional, Callable, Awaitable, Tuple, Set, AsyncIterable, AsyncIterator
+
+import codecs
+import io
+import os
+import re
+from os.path import basename, dirname
+import time
+import threading
+from collections import deque
+from bisect import bisect_right
+import numpy as np
+from cachetools import TLRUCache, TTLCache
+
+from config import Settings, get_settings
 
-# Fix for async event loop issues with containers and LlamaIndex
-if sys.platform == 'win32':
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-else:
-    # Docker/Linux environments - use default policy but ensure proper loop handling
-    asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
+# hybrid_system pulls in the LLM, embedding and database stacks - import it when the system is first built
+if TYPE_CHECKING:
+    from hybrid_system import HybridSearchSystem
+
+logger = logging.getLogger(__name__)
 
-try:
-    import nest_asyncio
-    nest_asyncio.apply()
+def enable_nested_loops() -> bool:
+    """Allow nested event loops via nest_asyncio (e.g. when embedding the backend in Jupyter)
     
-    # Ensure we have a proper event loop for Docker containers
+    Only the stdlib event loop can be patched - set ALLOW_NESTED_LOOPS=true so uvloop is not selected.
+    """
+    if hasattr(asyncio, "_nest_patched"):
+        return True
     try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-except ImportError:
-    pass
-from datetime import datetime
-from typing import List, Dict, Any, Union, Optional
-from pathlib import Path
+        import nest_asyncio
+        nest_asyncio.apply()
+        return True
+    except ImportError:
+        logger.warning("nest_asyncio is not installed - nested event loops are not available")
+    except ValueError as e:
+        logger.warning("Cannot enable nested event loops: %s", e)
+    return False
 
-from config import Settings
-from hybrid_system import HybridSearchSystem
-from sources import FileSystemSource
+def configure_event_loop() -> str:
+    """Select the event loop policy for a server process - call before its event loop is created
+    
+    Returns the loop chosen ("uvloop" or "asyncio"), for servers such as uvicorn that set up their own.
+    """
+    if sys.platform == 'win32':
+        # Fix for async event loop issues with LlamaIndex on Windows
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        return "asyncio"
+    if get_settings().allow_nested_loops:
+        # nest_asyncio can only patch the stdlib event loop
+        asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
+        return "asyncio"
+    # Docker/Linux environments - use uvloop when installed for faster task scheduling and I/O
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
+        return "asyncio"
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return "uvloop"
 
-logger = logging.getLogger(__name__)
+# Processing records expire this long after their last update - sooner once the job has finished
+PROCESSING_STATUS_TTL = 3600
+FINISHED_STATUS_TTL = 600
+_TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Per-file fields kept once a job has finished (what the UIs render)
+_FINISHED_FILE_FIELDS = ("index", "filename", "status", "progress", "phase", "error")
+
+def _status_expiry(processing_id: str, record: Dict[str, Any], now: float) -> float:
+    """Expiry time for a processing record, evaluated each time it is stored"""
+    return now + (FINISHED_STATUS_TTL if record.get("status") in _TERMINAL_STATUSES else PROCESSING_STATUS_TTL)
+
+# Global processing status storage - bounded, finished records expire after FINISHED_STATUS_TTL
+PROCESSING_STATUS = TLRUCache(maxsize=1024, ttu=_status_expiry)
+
+# Optional status fields that are dropped when an update does not supply them
+# (individual_files is kept - file progress helpers mutate that list in place)
+_TRANSIENT_STATUS_FIELDS = frozenset({"current_file", "current_phase", "files_completed", "total_files",
+                                      "file_progress", "estimated_time_remaining"})
+
+# Static health response shared by every health check
+_HEALTH_OK = {"success": True, "status": "ok"}
+
+# How long a get_system_status snapshot may be reused (seconds)
+STATUS_CACHE_TTL = 1.0
+
+# Status updates pushed to subscribers are coalesced over this window (seconds)
+STATUS_PUSH_INTERVAL = 0.1
+
+# Ingestion error classification ("timeout" also covers request/connection timeouts)
+_TIMEOUT_ERROR_RE = re.compile(r"timeout|timed out", re.IGNORECASE)
+_INTERRUPTED_ERROR_RE = re.compile(r"cancelled|aborted|interrupted", re.IGNORECASE)
 
-# Global processing status storage
-PROCESSING_STATUS = {}
+# Repository data sources: HybridSearchSystem ingest method and display name
+_REPOSITORY_SOURCES = {
+    "cmis": ("ingest_cmis", "CMIS"),
+    "alfresco": ("ingest_alfresco", "Alfresco"),
+}
+
+# Quote characters stripped from both ends of user-supplied paths
+_PATH_QUOTES = "\"'"
+
+# File types that need full Docling conversion (slower to process)
+_COMPLEX_SUFFIXES = (".pdf", ".docx", ".pptx", ".xlsx")
+
+# Processing time estimate buckets (file counts and single-file sizes in MB)
+ESTIMATE_FEW_FILES = 5
+ESTIMATE_SEVERAL_FILES = 10
+ESTIMATE_SMALL_FILE_MB = 1
+ESTIMATE_MEDIUM_FILE_MB = 5
+# Cached directory stats are reused for at most this long (seconds) - a root mtime misses nested changes
+ESTIMATE_CACHE_WINDOW = 60
+# (upper bounds, labels) - a size below bounds[i] maps to labels[i], anything larger to the last label
+_CONTENT_BUCKETS = ((1000, 5000), ("30-60 seconds", "1-2 minutes", "2-3 minutes"))
+_SINGLE_FILE_BUCKETS = ((ESTIMATE_SMALL_FILE_MB, ESTIMATE_MEDIUM_FILE_MB), ("30-60 seconds", "1-2 minutes", "2-4 minutes"))
+
+def _bucket(size: float, table: Tuple[Tuple[float, ...], Tuple[str, ...]]) -> str:
+    """Map a size onto the label of the first bucket whose upper bound exceeds it"""
+    bounds, labels = table
+    return labels[bisect_right(bounds, size)]
+
+def _scan_tree(path: str):
+    """Yield a DirEntry for every file below path using os.scandir"""
+    stack = deque([path])
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+@lru_cache(maxsize=256)
+def _compute_tree_stats(path: str, root_mtime: int, window: int) -> Tuple[int, int, bool]:
+    """Count files, the first file's bytes and complex types below path (stops once the many-files bucket is reached)
+
+    Size only picks the bucket when there is a single file, so later files are counted without a stat.
+    """
+    file_count = 0
+    first_size = 0
+    has_complex_files = False
+    for entry in _scan_tree(path):
+        if file_count == 0:
+            try:
+                first_size = entry.stat().st_size
+            except OSError:
+                pass
+        file_count += 1
+        has_complex_files = has_complex_files or entry.name.lower().endswith(_COMPLEX_SUFFIXES)
+        if file_count > ESTIMATE_SEVERAL_FILES:
+            break
+    return file_count, first_size, has_complex_files
+
+def clear_estimate_cache() -> None:
+    """Forget cached directory stats so the next estimate rescans"""
+    _compute_tree_stats.cache_clear()
 
 # File processing phases for dynamic time estimation
 PROCESSING_PHASES = {
@@ -48,86 +183,230 @@ PROCESSING_PHASES = {
     "indexing": {"weight": 0.1, "name": "Building indexes"}
 }
 
+def _phase_starts(phases: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """Progress percentage at which each phase starts (cumulative weight of the phases before it)"""
+    starts = {}
+    total_weight = 0.0
+    for name, phase in phases.items():
+        starts[name] = int(round(total_weight * 100))
+        total_weight += phase["weight"]
+    return starts
+
+PHASE_CUMULATIVE = _phase_starts(PROCESSING_PHASES)
+
+@dataclass(frozen=True, slots=True)
+class IngestJob:
+    """One document ingestion run, fixed when it is started"""
+    data_source: str
+    paths: Optional[List[str]] = None
+    cmis_config: Optional[Dict[str, Any]] = None
+    alfresco_config: Optional[Dict[str, Any]] = None
+    
+    @property
+    def source_config(self) -> Optional[Dict[str, Any]]:
+        """Connection settings for repository data sources"""
+        if self.data_source == "cmis":
+            return self.cmis_config
+        if self.data_source == "alfresco":
+            return self.alfresco_config
+        return None
+
+class SemanticQueryCache:
+    """Caches query answers by embedding similarity so paraphrased questions reuse an answer"""
+    
+    def __init__(self, threshold: float = 0.95, maxsize: int = 2000, ttl: float = 300):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._matrix: Optional[np.ndarray] = None  # one L2-normalized embedding per row
+        self._answers: List[Dict[str, Any]] = []
+        self._created: List[float] = []
+        self._last_used: List[float] = []
+    
+    def __len__(self) -> int:
+        return len(self._answers)
+    
+    @staticmethod
+    def _normalize(embedding) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+    
+    def _drop(self, keep: np.ndarray):
+        """Keep only the rows selected by the boolean mask"""
+        self._matrix = self._matrix[keep] if keep.any() else None
+        self._answers = [a for a, k in zip(self._answers, keep) if k]
+        self._created = [c for c, k in zip(self._created, keep) if k]
+        self._last_used = [u for u, k in zip(self._last_used, keep) if k]
+    
+    def _expire(self, now: float):
+        if self._answers:
+            keep = np.asarray(self._created) > now - self.ttl
+            if not keep.all():
+                self._drop(keep)
+    
+    def lookup(self, embedding) -> Optional[Dict[str, Any]]:
+        """Return the cached answer for the most similar query above the threshold"""
+        now = time.monotonic()
+        self._expire(now)
+        vector = self._normalize(embedding)
+        if self._matrix is None or vector is None or vector.shape[0] != self._matrix.shape[1]:
+            return None
+        
+        # Cosine similarity against every cached query in one matrix-vector product
+        similarities = self._matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        self._last_used[best] = now
+        return self._answers[best]
+    
+    def add(self, embedding, answer: Dict[str, Any]):
+        """Cache an answer, evicting the least recently used entry when full"""
+        now = time.monotonic()
+        self._expire(now)
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        if self._matrix is not None and vector.shape[0] != self._matrix.shape[1]:
+            # Embedding model changed - old vectors are not comparable
+            self.clear()
+        if len(self._answers) >= self.maxsize:
+            keep = np.ones(len(self._answers), dtype=bool)
+            keep[int(np.argmin(self._last_used))] = False
+            self._drop(keep)
+        
+        row = vector[np.newaxis, :]
+        self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+        self._answers.append(answer)
+        self._created.append(now)
+        self._last_used.append(now)
+    
+    def clear(self):
+        self._matrix = None
+        self._answers = []
+        self._created = []
+        self._last_used = []
+
+def _offer_latest(queue: asyncio.Queue, item: Any):
+    """Put item on a bounded queue, replacing an update the consumer has not read yet"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
 class FlexibleGraphRAGBackend:
     """Shared backend core for both REST API and MCP server"""
     
-    def __init__(self, settings: Settings = None):
-        self.settings = settings or Settings()
+    def __init__(self, settings: Settings = None, warmup: bool = False):
+        self.settings = settings or get_settings()
         self._system = None
+        self._system_lock = threading.Lock()
+        
+        # Settings do not change after construction - build the config view once
+        self._config_snapshot = {
+            "data_source": self.settings.data_source,
+            "vector_db": self.settings.vector_db,
+            "graph_db": self.settings.graph_db,
+            "search_db": self.settings.search_db,
+            "llm_provider": self.settings.llm_provider
+        }
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._completion_suffix = self._build_completion_suffix()
+        
+        # Status push subscribers per processing ID - (event loop, queue) pairs
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._pending_pushes: Dict[str, Dict[str, Any]] = {}  # latest unsent record per processing ID
+        self._pending_lock = threading.Lock()  # status updates also arrive from worker threads
+        
+        # Background ingestion runs and cleanup of cancelled runs (references kept so the
+        # tasks are not garbage collected mid-run)
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._cleanup_tasks: Set[asyncio.Task] = set()
+        
+        # Search/query result cache - invalidated whenever an ingestion completes
+        self._result_cache = TTLCache(maxsize=self.settings.query_cache_size, ttl=self.settings.query_cache_ttl)
+        self._inflight: Dict[Tuple, asyncio.Future] = {}  # identical concurrent requests share one computation
+        self._semantic_cache = SemanticQueryCache(
+            threshold=self.settings.semantic_cache_threshold,
+            maxsize=self.settings.semantic_cache_size,
+            ttl=self.settings.query_cache_ttl
+        )
         logger.info("FlexibleGraphRAGBackend initialized")
+        
+        if warmup:
+            self.warmup()
     
     @property
-    def system(self) -> HybridSearchSystem:
+    def system(self) -> "HybridSearchSystem":
         """Lazy-load the hybrid search system"""
         if self._system is None:
-            self._system = HybridSearchSystem.from_settings(self.settings)
-            logger.info("HybridSearchSystem initialized")
+            # warmup may run in a worker thread while requests arrive - build the system only once
+            with self._system_lock:
+                if self._system is None:
+                    from hybrid_system import HybridSearchSystem
+                    self._system = HybridSearchSystem.from_settings(self.settings)
+                    logger.info("HybridSearchSystem initialized")
         return self._system
     
+    def warmup(self) -> bool:
+        """Initialize the hybrid search system ahead of the first request"""
+        try:
+            self.system
+            return True
+        except Exception as e:
+            logger.warning("System warmup failed - will initialize on first request: %s", e)
+            return False
+    
     # Processing status management
     
     def _create_processing_id(self) -> str:
-        """Create a unique processing ID"""
-        return str(uuid.uuid4())[:8]
+        """Create a unique processing ID (8 hex chars, retried if it is still in use)"""
+        while True:
+            processing_id = secrets.token_hex(4)
+            if processing_id not in PROCESSING_STATUS:
+                return processing_id
     
     def _estimate_processing_time(self, data_source: str = None, paths: List[str] = None, content: str = None) -> str:
         """Estimate processing time based on input size and type"""
         try:
             if content:
                 # Text content - quick processing
-                char_count = len(content)
-                if char_count < 1000:
-                    return "30-60 seconds"
-                elif char_count < 5000:
-                    return "1-2 minutes"
-                else:
-                    return "2-3 minutes"
+                return _bucket(len(content), _CONTENT_BUCKETS)
             
             elif paths:
-                import os
                 total_size = 0
                 file_count = 0
                 has_complex_files = False
                 
                 for path in paths:
                     if os.path.isfile(path):
-                        file_count += 1
-                        size = os.path.getsize(path)
-                        total_size += size
-                        
-                        # Check for complex file types
-                        ext = os.path.splitext(path)[1].lower()
-                        if ext in ['.pdf', '.docx', '.pptx', '.xlsx']:
-                            has_complex_files = True
+                        # Size only matters for a lone file - skip the stat once another file was seen
+                        size = os.path.getsize(path) if file_count == 0 else 0
+                        count, complex_files = 1, path.lower().endswith(_COMPLEX_SUFFIXES)
                     elif os.path.isdir(path):
-                        # Estimate directory contents
-                        for root, dirs, files in os.walk(path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                try:
-                                    file_count += 1
-                                    size = os.path.getsize(file_path)
-                                    total_size += size
-                                    ext = os.path.splitext(file)[1].lower()
-                                    if ext in ['.pdf', '.docx', '.pptx', '.xlsx']:
-                                        has_complex_files = True
-                                except:
-                                    continue
+                        # Directory modification time invalidates the cached stats when entries change,
+                        # the time window bounds staleness from changes in nested directories
+                        count, size, complex_files = _compute_tree_stats(
+                            path, os.stat(path).st_mtime_ns, int(time.time() // ESTIMATE_CACHE_WINDOW))
+                    else:
+                        continue
+                    file_count += count
+                    total_size += size
+                    has_complex_files = has_complex_files or complex_files
+                    # The "many files" bucket does not depend on size or type - stop scanning
+                    if file_count > ESTIMATE_SEVERAL_FILES:
+                        break
                 
                 # Size-based estimation
                 size_mb = total_size / (1024 * 1024)
                 
                 if file_count == 0:
                     return "30 seconds"
-                elif file_count == 1 and size_mb < 1:
-                    return "30-60 seconds"  # Single small file
-                elif file_count == 1 and size_mb < 5:
-                    return "1-2 minutes"    # Single medium file
                 elif file_count == 1:
-                    return "2-4 minutes"    # Single large file
-                elif file_count <= 5 and not has_complex_files:
+                    return _bucket(size_mb, _SINGLE_FILE_BUCKETS)
+                elif file_count <= ESTIMATE_FEW_FILES and not has_complex_files:
                     return "1-3 minutes"    # Few simple files
-                elif file_count <= 10:
+                elif file_count <= ESTIMATE_SEVERAL_FILES:
                     return "2-5 minutes"    # Several files
                 else:
                     return "3-8 minutes"    # Many files
@@ -135,7 +414,7 @@ class FlexibleGraphRAGBackend:
             return "2-4 minutes"  # Default fallback
             
         except Exception as e:
-            logger.warning(f"Error estimating processing time: {e}")
+            logger.warning("Error estimating processing time: %s", e)
             return "2-4 minutes"  # Safe fallback
     
     def _update_processing_status(self, processing_id: str, status: str, message: str, progress: int = 0, 
@@ -143,27 +422,34 @@ class FlexibleGraphRAGBackend:
                                   files_completed: int = 0, total_files: int = 0,
                                   estimated_time_remaining: str = None, file_progress: List[Dict] = None):
         """Update processing status with dynamic timing information"""
-        current_time = datetime.now()
-        existing_status = PROCESSING_STATUS.get(processing_id, {})
-        started_at = existing_status.get("started_at", current_time.isoformat())
+        now_wall = time.time()
+        now_monotonic = time.monotonic()
+        current = PROCESSING_STATUS.get(processing_id)
+        if current is None:
+            status_update = {
+                "processing_id": processing_id,
+                "_started_at": now_wall,  # Wall-clock times are serialized in get_processing_status
+                "_start_monotonic": now_monotonic,
+                "version": 0
+            }
+        elif (current["status"], current["message"], current["progress"]) == (status, message, progress) \
+                and not (current_file or current_phase or total_files or estimated_time_remaining or file_progress) \
+                and _TRANSIENT_STATUS_FIELDS.isdisjoint(current):
+            # Identical update - nothing would change, so skip the version bump and publish
+            return
+        else:
+            # Build the new record in one pass without the transient fields, then swap it in below -
+            # readers see the old or the new record, never a mix
+            status_update = {key: value for key, value in current.items() if key not in _TRANSIENT_STATUS_FIELDS}
         
         # Calculate dynamic time estimates if we have timing info
-        if isinstance(started_at, str):
-            start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-        else:
-            start_time = started_at
-            
-        elapsed_seconds = (current_time - start_time).total_seconds()
+        elapsed_seconds = now_monotonic - status_update["_start_monotonic"]
         
-        # Build enhanced status
-        status_update = {
-            "processing_id": processing_id,
-            "status": status,
-            "message": message,
-            "progress": progress,
-            "updated_at": current_time.isoformat(),
-            "started_at": started_at if isinstance(started_at, str) else started_at.isoformat()
-        }
+        status_update["status"] = status
+        status_update["message"] = message
+        status_update["progress"] = progress
+        status_update["_updated_at"] = now_wall
+        status_update["version"] += 1  # Bumped on every change, used for ETags
         
         # Add file-level progress information
         if current_file:
@@ -179,41 +465,111 @@ class FlexibleGraphRAGBackend:
         if estimated_time_remaining:
             status_update["estimated_time_remaining"] = estimated_time_remaining
         elif total_files > 0 and files_completed > 0 and elapsed_seconds > 0:
-            # Calculate based on files completed so far
-            avg_time_per_file = elapsed_seconds / files_completed
-            remaining_files = total_files - files_completed
-            estimated_remaining = avg_time_per_file * remaining_files
-            
-            if estimated_remaining < 60:
-                status_update["estimated_time_remaining"] = f"{int(estimated_remaining)} seconds"
-            elif estimated_remaining < 3600:
-                status_update["estimated_time_remaining"] = f"{int(estimated_remaining / 60)} minutes"
-            else:
-                status_update["estimated_time_remaining"] = f"{estimated_remaining / 3600:.1f} hours"
+            # Only recalculate when another file has completed - reuse the last estimate otherwise
+            if files_completed != status_update.get("_last_eta_files_completed"):
+                # Calculate based on files completed so far
+                avg_time_per_file = elapsed_seconds / files_completed
+                remaining_files = total_files - files_completed
+                estimated_remaining = avg_time_per_file * remaining_files
+                
+                if estimated_remaining < 60:
+                    status_update["_eta"] = f"{int(estimated_remaining)} seconds"
+                elif estimated_remaining < 3600:
+                    status_update["_eta"] = f"{int(estimated_remaining / 60)} minutes"
+                else:
+                    status_update["_eta"] = f"{estimated_remaining / 3600:.1f} hours"
+                status_update["_last_eta_files_completed"] = files_completed
+            status_update["estimated_time_remaining"] = status_update["_eta"]
         
-        # Add individual file progress tracking
-        if file_progress:
+        # Add individual file progress tracking - only a new list needs storing
+        if file_progress is not None and file_progress is not status_update.get("individual_files"):
             status_update["individual_files"] = file_progress
+        if status in _TERMINAL_STATUSES and "individual_files" in status_update:
+            self._summarize_file_progress(status_update)
         
+        # Storing the record also restarts its expiry from the latest update
         PROCESSING_STATUS[processing_id] = status_update
+        if processing_id in self._subscribers:
+            self._publish_status(processing_id, status_update)
+        if status == "completed":
+            # New content is searchable - cached results are stale
+            self.clear_cache()
         if total_files > 0:
-            logger.info(f"Processing {processing_id}: {status} - {message} ({files_completed + 1}/{total_files} files)")
+            logger.info("Processing %s: %s - %s (%s/%s files)", processing_id, status, message, files_completed + 1, total_files)
         else:
-            logger.info(f"Processing {processing_id}: {status} - {message}")
+            logger.info("Processing %s: %s - %s", processing_id, status, message)
     
     def get_processing_status(self, processing_id: str) -> Dict[str, Any]:
         """Get processing status by ID"""
-        if processing_id not in PROCESSING_STATUS:
+        record = PROCESSING_STATUS.get(processing_id)
+        if record is None:
             return {"success": False, "error": f"Processing ID {processing_id} not found"}
         
-        return {"success": True, "processing": PROCESSING_STATUS[processing_id]}
+        return {"success": True, "processing": self._status_view(record)}
+    
+    def _status_view(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Public view of a processing record - internal fields hidden, times serialized"""
+        processing = {key: value for key, value in record.items() if not key.startswith("_")}
+        processing["started_at"] = datetime.fromtimestamp(record["_started_at"]).isoformat()
+        processing["updated_at"] = datetime.fromtimestamp(record["_updated_at"]).isoformat()
+        return processing
+    
+    def subscribe_processing(self, processing_id: str) -> asyncio.Queue:
+        """Register for pushed status updates; the queue only ever holds the latest update"""
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(processing_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+    
+    def unsubscribe_processing(self, processing_id: str, queue: asyncio.Queue):
+        """Remove a queue registered with subscribe_processing"""
+        subscribers = [entry for entry in self._subscribers.get(processing_id, []) if entry[1] is not queue]
+        if subscribers:
+            self._subscribers[processing_id] = subscribers
+        else:
+            self._subscribers.pop(processing_id, None)
+    
+    def _publish_status(self, processing_id: str, record: Dict[str, Any]):
+        """Push status to subscribers, coalescing bursts (safe to call from worker threads)"""
+        if record["status"] in _TERMINAL_STATUSES:
+            # Final states are sent straight away
+            with self._pending_lock:
+                self._pending_pushes.pop(processing_id, None)
+            self._push_status(processing_id, record)
+            return
+        
+        with self._pending_lock:
+            first_pending = processing_id not in self._pending_pushes
+            self._pending_pushes[processing_id] = record
+        subscribers = self._subscribers.get(processing_id)
+        if first_pending and subscribers:
+            loop = subscribers[0][0]
+            loop.call_soon_threadsafe(loop.call_later, STATUS_PUSH_INTERVAL, self._flush_status, processing_id)
+    
+    def _flush_status(self, processing_id: str):
+        """Push the latest pending status for a processing ID"""
+        with self._pending_lock:
+            record = self._pending_pushes.pop(processing_id, None)
+        if record is not None:
+            self._push_status(processing_id, record)
+    
+    def _push_status(self, processing_id: str, record: Dict[str, Any]):
+        snapshot = self._status_view(record)
+        for loop, queue in self._subscribers.get(processing_id, []):
+            loop.call_soon_threadsafe(_offer_latest, queue, snapshot)
+    
+    def get_processing_etag(self, processing_id: str) -> Optional[str]:
+        """Get the ETag for the current version of a processing status"""
+        status = PROCESSING_STATUS.get(processing_id)
+        if status is None:
+            return None
+        return f'"{processing_id}:{status.get("version", 0)}"'
     
     def cancel_processing(self, processing_id: str) -> Dict[str, Any]:
         """Cancel a processing operation"""
-        if processing_id not in PROCESSING_STATUS:
+        status = PROCESSING_STATUS.get(processing_id)
+        if status is None:
             return {"success": False, "error": f"Processing ID {processing_id} not found"}
             
-        status = PROCESSING_STATUS[processing_id]
         if status["status"] in ["started", "processing"]:
             self._update_processing_status(
                 processing_id, 
@@ -227,14 +583,14 @@ class FlexibleGraphRAGBackend:
     
     def _is_processing_cancelled(self, processing_id: str) -> bool:
         """Check if processing has been cancelled"""
-        return (processing_id in PROCESSING_STATUS and 
-                PROCESSING_STATUS[processing_id]["status"] == "cancelled")
+        record = PROCESSING_STATUS.get(processing_id)
+        return record is not None and record["status"] == "cancelled"
     
     def _initialize_file_progress(self, processing_id: str, file_paths: List[str]) -> List[Dict]:
         """Initialize per-file progress tracking"""
         file_progress = []
         for i, file_path in enumerate(file_paths):
-            filename = Path(file_path).name
+            filename = basename(file_path)
             file_progress.append({
                 "index": i,
                 "filename": filename,
@@ -249,19 +605,51 @@ class FlexibleGraphRAGBackend:
             })
         return file_progress
     
+    def _summarize_file_progress(self, record: Dict[str, Any]):
+        """Shrink per-file entries of a finished job to what the UI shows and add a summary"""
+        files = record["individual_files"]
+        first_failed = next((f["filename"] for f in files if f["status"] == "failed"), None)
+        record["files_summary"] = {
+            "completed": record.get("_completed_count", 0),
+            "failed": record.get("_failed_count", 0),
+            "first_failed": first_failed
+        }
+        record["individual_files"] = [
+            {field: f[field] for field in _FINISHED_FILE_FIELDS if f.get(field) is not None}
+            for f in files
+        ]
+    
     def _update_file_progress(self, processing_id: str, file_index: int, status: str = None, 
                              progress: int = None, phase: str = None, message: str = None, error: str = None):
         """Update progress for a specific file"""
+        self._bulk_update_file_progress(processing_id, [file_index], status=status, progress=progress,
+                                        phase=phase, message=message, error=error)
+    
+    def _bulk_update_file_progress(self, processing_id: str, indices: List[int], status: str = None, 
+                                  progress: int = None, phase: str = None, message: str = None, error: str = None):
+        """Update progress for several files and publish a single status update"""
         current_status = PROCESSING_STATUS.get(processing_id, {})
         file_progress = current_status.get("individual_files", [])
+        indices = [i for i in indices if i < len(file_progress)]
+        if not indices:
+            return
         
-        if file_index < len(file_progress):
-            file_info = file_progress[file_index]
-            current_time = datetime.now().isoformat()
+        # Only status changes stamp started_at/completed_at - plain progress updates skip the clock
+        current_time = datetime.now().isoformat() if status else None
+        completed_count = current_status.get("_completed_count", 0)
+        failed_count = current_status.get("_failed_count", 0)
+        for file_index in indices:
+            # Edit a copy and swap it in so a status read never sees a half-updated file
+            file_info = dict(file_progress[file_index])
             
             if status:
+                # Keep running completed/failed totals instead of rescanning every file
+                previous = file_info["status"]
+                if previous != status:
+                    completed_count += (status == "completed") - (previous == "completed")
+                    failed_count += (status == "failed") - (previous == "failed")
                 file_info["status"] = status
-                if status == "processing" and not file_info["started_at"]:
+                if status == "processing" and not file_info.get("started_at"):
                     file_info["started_at"] = current_time
                 elif status in ["completed", "failed"]:
                     file_info["completed_at"] = current_time
@@ -274,27 +662,30 @@ class FlexibleGraphRAGBackend:
                 file_info["message"] = message
             if error:
                 file_info["error"] = error
-            
-            # Update the main status with the new file progress
-            completed_count = sum(1 for f in file_progress if f["status"] == "completed")
-            logger.info(f"File progress update: {file_info['filename']} -> {status} ({progress}%) - {completed_count}/{len(file_progress)} completed")
-            
-            self._update_processing_status(
-                processing_id,
-                current_status.get("status", "processing"),
-                current_status.get("message", "Processing files..."),
-                current_status.get("progress", 0),
-                current_file=file_info["filename"],
-                current_phase=phase,
-                files_completed=completed_count,
-                total_files=len(file_progress),
-                file_progress=file_progress
-            )
+            file_progress[file_index] = file_info
+        
+        # Update the main status with the new file progress
+        PROCESSING_STATUS[processing_id] = {**current_status, "_completed_count": completed_count,
+                                            "_failed_count": failed_count}
+        last_file = file_progress[indices[-1]]["filename"]
+        logger.debug("File progress update: %d file(s) through %s -> %s (%s%%) - %d/%d completed",
+                     len(indices), last_file, status, progress, completed_count, len(file_progress))
+        
+        self._update_processing_status(
+            processing_id,
+            current_status.get("status", "processing"),
+            current_status.get("message", "Processing files..."),
+            current_status.get("progress", 0),
+            current_file=last_file,
+            current_phase=phase,
+            files_completed=completed_count,
+            total_files=len(file_progress)
+        )
     
     async def _process_files_batch_with_progress(self, processing_id: str, file_paths: List[str]):
         """Process files in batch with per-file progress simulation"""
         try:
-            logger.info(f"Starting batch processing with per-file progress for {len(file_paths)} files")
+            logger.info("Starting batch processing with per-file progress for %s files", len(file_paths))
             
             # Get current status to preserve file_progress
             current_status = PROCESSING_STATUS.get(processing_id, {})
@@ -302,66 +693,45 @@ class FlexibleGraphRAGBackend:
             
             # If no existing file progress, initialize it
             if not existing_file_progress:
-                logger.warning(f"No existing file progress found for {processing_id}, initializing now")
+                logger.warning("No existing file progress found for %s, initializing now", processing_id)
                 existing_file_progress = self._initialize_file_progress(processing_id, file_paths)
             
-            logger.info(f"Found {len(existing_file_progress)} files in progress tracking")
+            logger.info("Found %s files in progress tracking", len(existing_file_progress))
+            
+            # Files still going through the pipeline - ones Docling could not convert drop out
+            all_files = list(range(len(file_paths)))
             
             # Mark all files as processing
-            for file_index in range(len(file_paths)):
-                self._update_file_progress(
-                    processing_id, file_index,
-                    status="processing",
-                    progress=0,
-                    phase="docling",
-                    message="Starting batch processing..."
-                )
+            self._bulk_update_file_progress(
+                processing_id, all_files,
+                status="processing",
+                progress=0,
+                phase="docling",
+                message="Starting batch processing..."
+            )
             
-            # Simulate progress updates during batch processing
-            async def progress_updater():
-                """Background task to simulate per-file progress during batch processing"""
-                phases = [
-                    ("docling", "Converting documents...", 20),
-                    ("chunking", "Splitting into chunks...", 40),
-                    ("kg_extraction", "Extracting knowledge graph...", 70),
-                    ("indexing", "Building indexes...", 90)
-                ]
-                
-                for phase_name, message, progress in phases:
-                    await asyncio.sleep(0.5)  # Wait between phases
-                    for file_index in range(len(file_paths)):
+            try:
+                # Progress callback driven by the real pipeline phases; completion is sent when processing truly finishes
+                def completion_callback(callback_processing_id=None, status=None, message=None, progress=None,
+                                        current_phase=None, **kwargs):
+                    if status == "processing" and current_phase:
+                        # Batch ingestion runs all files through each phase together
                         if not self._is_processing_cancelled(processing_id):
-                            self._update_file_progress(
-                                processing_id, file_index,
+                            self._bulk_update_file_progress(
+                                processing_id, all_files,
                                 progress=progress,
-                                phase=phase_name,
+                                phase=current_phase,
                                 message=message
                             )
-                    
-                    # Check for cancellation
-                    if self._is_processing_cancelled(processing_id):
-                        return
-            
-            # Start progress updater in background
-            progress_task = asyncio.create_task(progress_updater())
-            
-            try:
-                # Create a completion callback that will be called when processing truly finishes
-                def completion_callback(callback_processing_id=None, status=None, message=None, progress=None, **kwargs):
-                    if status == "completed" or (progress and progress >= 100):
+                    elif status == "completed" or (progress and progress >= 100):
                         # This is called from hybrid_system.py AFTER the completion logs
-                        logger.info(f"Real processing completed - now sending completion status to UI")
-                        
-                        # Use the processing_id from the outer scope
-                        current_status = PROCESSING_STATUS.get(processing_id, {})
-                        existing_file_progress = current_status.get("individual_files", [])
+                        logger.info("Real processing completed - now sending completion status to UI")
                         
                         # Optional: Clean up uploaded files after successful processing
                         # Check if files are from uploads directory
-                        from pathlib import Path
-                        upload_files = [f for f in file_paths if Path(f).parent.name == "uploads"]
+                        upload_files = [f for f in file_paths if basename(dirname(f)) == "uploads"]
                         if upload_files:
-                            logger.info(f"Processing completed successfully - uploaded files can be cleaned up if needed")
+                            logger.info("Processing completed successfully - uploaded files can be cleaned up if needed")
                             # Note: Cleanup is available via /api/cleanup-uploads endpoint
                         
                         completion_message = self._generate_completion_message(len(file_paths))
@@ -371,54 +741,72 @@ class FlexibleGraphRAGBackend:
                             completion_message, 
                             100,
                             total_files=len(file_paths),
-                            files_completed=len(file_paths),
-                            file_progress=existing_file_progress
+                            files_completed=len(file_paths)
+                        )
+                
+                # Per-file Docling results arrive as each concurrent conversion finishes
+                def file_converted(file_index: int, converted: bool):
+                    if self._is_processing_cancelled(processing_id):
+                        return
+                    if converted:
+                        self._update_file_progress(
+                            processing_id, file_index,
+                            progress=PHASE_CUMULATIVE["chunking"],
+                            message="Converted with Docling"
+                        )
+                    else:
+                        all_files.remove(file_index)
+                        self._update_file_progress(
+                            processing_id, file_index,
+                            status="failed",
+                            phase="error",
+                            message="Document could not be converted",
+                            error="Missing, unsupported or failed Docling conversion"
                         )
                 
                 # Actual batch processing - use completion callback for proper timing
                 await self.system.ingest_documents(
                     file_paths,
                     processing_id=processing_id,
-                    status_callback=completion_callback
+                    status_callback=completion_callback,
+                    file_callback=file_converted
                 )
                 
-                # Cancel progress updater since real processing is done
-                progress_task.cancel()
-                
                 # Mark all files as completed with a small delay to show 90% → 100% transition
-                for file_index in range(len(file_paths)):
-                    self._update_file_progress(
-                        processing_id, file_index,
-                        status="completed",
-                        progress=100,
-                        phase="completed",
-                        message="Processing completed successfully"
-                    )
+                self._bulk_update_file_progress(
+                    processing_id, all_files,
+                    status="completed",
+                    progress=100,
+                    phase="completed",
+                    message="Processing completed successfully"
+                )
                 
                 # No delay here - let the main method handle timing
                 
             except Exception as e:
-                # Cancel progress updater on error
-                progress_task.cancel()
-                
+                if self._is_processing_cancelled(processing_id):
+                    # Leave the files as they were - the run already reads as cancelled
+                    raise
                 # Mark all files as failed
-                for file_index in range(len(file_paths)):
-                    self._update_file_progress(
-                        processing_id, file_index,
-                        status="failed",
-                        progress=0,
-                        phase="error",
-                        message=f"Processing failed: {str(e)}",
-                        error=str(e)
-                    )
+                self._bulk_update_file_progress(
+                    processing_id, all_files,
+                    status="failed",
+                    progress=0,
+                    phase="error",
+                    message=f"Processing failed: {str(e)}",
+                    error=str(e)
+                )
                 raise e
             
             # Don't send completed status here - let the main method handle it
             # This avoids duplicate "completed" messages and ensures proper timing
-            logger.info(f"Batch processing completed for {len(file_paths)} files")
+            logger.info("Batch processing completed for %s files", len(file_paths))
             
         except Exception as e:
-            logger.error(f"Error in batch file processing: {str(e)}")
+            if self._is_processing_cancelled(processing_id):
+                # Propagate so _process_documents_async cleans up the partial run
+                raise
+            logger.error("Error in batch file processing: %s", e)
             self._update_processing_status(
                 processing_id,
                 "failed",
@@ -434,8 +822,8 @@ class FlexibleGraphRAGBackend:
                 if self._is_processing_cancelled(processing_id):
                     return
                 
-                filename = Path(file_path).name
-                logger.info(f"Starting processing of file {file_index + 1}/{len(file_paths)}: {filename}")
+                filename = basename(file_path)
+                logger.info("Starting processing of file %s/%s: %s", file_index + 1, len(file_paths), filename)
                 
                 # Update file status to processing
                 self._update_file_progress(
@@ -460,7 +848,7 @@ class FlexibleGraphRAGBackend:
                     )
                     
                 except Exception as e:
-                    logger.error(f"Error processing file {filename}: {str(e)}")
+                    logger.error("Error processing file %s: %s", filename, e)
                     self._update_file_progress(
                         processing_id, file_index,
                         status="failed",
@@ -473,8 +861,7 @@ class FlexibleGraphRAGBackend:
                     continue
             
             # Update overall progress to completed
-            completed_files = sum(1 for i in range(len(file_paths)) 
-                                if PROCESSING_STATUS.get(processing_id, {}).get("individual_files", [{}])[i].get("status") == "completed")
+            completed_files = PROCESSING_STATUS.get(processing_id, {}).get("_completed_count", 0)
             
             completion_message = self._generate_completion_message(completed_files)
             if completed_files < len(file_paths):
@@ -489,7 +876,7 @@ class FlexibleGraphRAGBackend:
             )
             
         except Exception as e:
-            logger.error(f"Error in file processing: {str(e)}")
+            logger.error("Error in file processing: %s", e)
             self._update_processing_status(
                 processing_id,
                 "failed",
@@ -500,66 +887,89 @@ class FlexibleGraphRAGBackend:
     async def _process_single_file_with_progress(self, processing_id: str, file_index: int, file_path: str):
         """Process a single file with detailed progress updates"""
         try:
-            filename = Path(file_path).name
-            logger.info(f"Processing file {file_index + 1}: {filename}")
+            filename = basename(file_path)
+            logger.info("Processing file %s: %s", file_index + 1, filename)
             
             # Phase 1: Document conversion (Docling)
             self._update_file_progress(
                 processing_id, file_index,
-                progress=10,
+                progress=PHASE_CUMULATIVE["docling"],
                 phase="docling",
-                message="Converting document format..."
+                message=f'{PROCESSING_PHASES["docling"]["name"]}...'
             )
-            logger.info(f"File {filename}: Starting document conversion")
-            await asyncio.sleep(0.5)  # Small delay to make progress visible
+            logger.info("File %s: Starting document conversion", filename)
+            await asyncio.sleep(self.settings.ui_progress_delay_ms / 1000)  # Optional delay to make progress visible
             
             # Phase 2: Text chunking
             self._update_file_progress(
                 processing_id, file_index,
-                progress=30,
+                progress=PHASE_CUMULATIVE["chunking"],
                 phase="chunking",
-                message="Splitting into chunks..."
+                message=f'{PROCESSING_PHASES["chunking"]["name"]}...'
             )
-            logger.info(f"File {filename}: Starting text chunking")
-            await asyncio.sleep(0.5)  # Small delay to make progress visible
+            logger.info("File %s: Starting text chunking", filename)
+            await asyncio.sleep(self.settings.ui_progress_delay_ms / 1000)  # Optional delay to make progress visible
             
             # Phase 3: Knowledge graph extraction
             self._update_file_progress(
                 processing_id, file_index,
-                progress=50,
+                progress=PHASE_CUMULATIVE["kg_extraction"],
                 phase="kg_extraction",
-                message="Extracting knowledge graph..."
+                message=f'{PROCESSING_PHASES["kg_extraction"]["name"]}...'
             )
-            logger.info(f"File {filename}: Starting knowledge graph extraction")
+            logger.info("File %s: Starting knowledge graph extraction", filename)
             
             # Actual processing - call the system with single file
             # Note: This processes the single file through the full pipeline
             await self.system.ingest_documents(
                 [file_path],
                 processing_id=processing_id,
-                status_callback=lambda pid, status, msg, prog, **kwargs: self._update_file_progress(
-                    processing_id, file_index, progress=min(50 + int(prog * 0.4), 90)
+                status_callback=lambda progress=0, current_phase=None, **kwargs: self._update_file_progress(
+                    processing_id, file_index, phase=current_phase,
+                    progress=min(PHASE_CUMULATIVE["kg_extraction"] + int(progress * PROCESSING_PHASES["kg_extraction"]["weight"]),
+                                 PHASE_CUMULATIVE["indexing"])
                 )
             )
             
             # Phase 4: Indexing
             self._update_file_progress(
                 processing_id, file_index,
-                progress=90,
+                progress=PHASE_CUMULATIVE["indexing"],
                 phase="indexing",
-                message="Building indexes..."
+                message=f'{PROCESSING_PHASES["indexing"]["name"]}...'
             )
-            logger.info(f"File {filename}: Completed processing")
-            await asyncio.sleep(0.5)  # Small delay to make progress visible
+            logger.info("File %s: Completed processing", filename)
+            await asyncio.sleep(self.settings.ui_progress_delay_ms / 1000)  # Optional delay to make progress visible
             
         except Exception as e:
-            logger.error(f"Error in single file processing: {str(e)}")
+            logger.error("Error in single file processing: %s", e)
             raise e
     
+    def _schedule_cleanup(self, processing_id: str):
+        """Start _cleanup_partial_processing as a background task (at most once per processing ID)"""
+        record = PROCESSING_STATUS.get(processing_id)
+        if record is not None:
+            if record.get("_cleanup_scheduled"):
+                return
+            PROCESSING_STATUS[processing_id] = {**record, "_cleanup_scheduled": True}
+        self._start_task(self._cleanup_partial_processing(processing_id), self._cleanup_tasks)
+    
+    def _start_task(self, coro: Awaitable, tasks: Set[asyncio.Task]) -> asyncio.Task:
+        """Run coro as a task held in tasks until it finishes"""
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+    
+    async def shutdown(self):
+        """Wait for background cleanup of cancelled runs to finish"""
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+    
     async def _cleanup_partial_processing(self, processing_id: str):
         """Clean up partial processing artifacts when cancelled"""
         try:
-            logger.info(f"Cleaning up partial processing for {processing_id}")
+            logger.info("Cleaning up partial processing for %s", processing_id)
             
             # Check if we have a fully functional system (completed previous ingestion)
             has_complete_system = (
@@ -570,14 +980,19 @@ class FlexibleGraphRAGBackend:
             
             if has_complete_system:
                 # System was fully functional from previous ingestion - preserve it
-                logger.info(f"Preserving existing functional system state after cancellation of {processing_id}")
+                logger.info("Preserving existing functional system state after cancellation of %s", processing_id)
                 # Only clean up processing-specific state, not the core indexes
-                if processing_id in PROCESSING_STATUS:
-                    PROCESSING_STATUS[processing_id]["status"] = "cancelled"
-                    PROCESSING_STATUS[processing_id]["message"] = "Processing cancelled - existing data preserved"
+                record = PROCESSING_STATUS.get(processing_id)
+                if record is not None:
+                    PROCESSING_STATUS[processing_id] = {
+                        **record,
+                        "status": "cancelled",
+                        "message": "Processing cancelled - existing data preserved",
+                        "version": record.get("version", 0) + 1
+                    }
             else:
                 # System was in partial state, safe to clear everything
-                logger.info(f"Clearing partial system state after cancellation of {processing_id}")
+                logger.info("Clearing partial system state after cancellation of %s", processing_id)
                 if hasattr(self.system, 'vector_index'):
                     self.system.vector_index = None
                 if hasattr(self.system, 'graph_index'):
@@ -589,15 +1004,22 @@ class FlexibleGraphRAGBackend:
                 if hasattr(self.system, '_clear_partial_state'):
                     self.system._clear_partial_state()
             
-            logger.info(f"Cleanup completed for {processing_id}")
+            logger.info("Cleanup completed for %s", processing_id)
         except Exception as e:
-            logger.error(f"Error during cleanup for {processing_id}: {str(e)}")
+            logger.error("Error during cleanup for %s: %s", processing_id, e)
     
     # Core business logic methods
     
-    async def ingest_documents(self, data_source: str = None, paths: List[str] = None, **kwargs) -> Dict[str, Any]:
+    async def ingest_documents(self, data_source: str = None, paths: List[str] = None,
+                               cmis_config: Dict[str, Any] = None, alfresco_config: Dict[str, Any] = None) -> Dict[str, Any]:
         """Start async document ingestion and return processing ID"""
         processing_id = self._create_processing_id()
+        job = IngestJob(
+            data_source=data_source or self.settings.data_source,
+            paths=paths,
+            cmis_config=cmis_config,
+            alfresco_config=alfresco_config
+        )
         
         # Start processing immediately in background
         self._update_processing_status(
@@ -608,9 +1030,10 @@ class FlexibleGraphRAGBackend:
         )
         
         # Start background task
-        asyncio.create_task(self._process_documents_async(processing_id, data_source, paths, **kwargs))
+        self._start_task(self._process_documents_async(processing_id, job), self._background_tasks)
         
-        estimated_time = self._estimate_processing_time(data_source, paths)
+        # Sizing paths stats files and walks directories - keep that off the event loop
+        estimated_time = await asyncio.to_thread(self._estimate_processing_time, job.data_source, job.paths)
         
         return {
             "processing_id": processing_id,
@@ -619,22 +1042,42 @@ class FlexibleGraphRAGBackend:
             "estimated_time": estimated_time
         }
     
-    async def _process_documents_async(self, processing_id: str, data_source: str = None, paths: List[str] = None, **kwargs):
+    async def _ingest_repository(self, processing_id: str, data_source: str, source_config: Dict[str, Any] = None):
+        """Ingest from a CMIS/Alfresco repository (progress past connecting is reported by the system)"""
+        ingest_method, label = _REPOSITORY_SOURCES[data_source]
+        self._update_processing_status(
+            processing_id, 
+            "processing", 
+            f"Connecting to {label} repository...", 
+            20
+        )
+        
+        # Check for cancellation before connecting
+        if self._is_processing_cancelled(processing_id):
+            return
+        
+        ingest = getattr(self.system, ingest_method)
+        await ingest(source_config, processing_id=processing_id, status_callback=self._update_processing_status)
+        
+        self._update_processing_status(
+            processing_id, 
+            "completed", 
+            f"Successfully ingested documents from {label} repository!", 
+            100
+        )
+    
+    async def _process_documents_async(self, processing_id: str, job: IngestJob):
         """Background task for document processing"""
         try:
-            data_source = data_source or self.settings.data_source
+            data_source = job.data_source
+            paths = job.paths
             
             # Check for cancellation before starting
             if self._is_processing_cancelled(processing_id):
                 return
-                
-            self._update_processing_status(
-                processing_id, 
-                "processing", 
-                f"Initializing {data_source} document ingestion...", 
-                10
-            )
             
+            # Each branch reports its first status before awaiting anything, so no separate
+            # "initializing" update is sent - it would be overwritten before anyone could read it
             if data_source == "filesystem":
                 file_paths = paths or self.settings.source_paths
                 if not file_paths:
@@ -646,20 +1089,16 @@ class FlexibleGraphRAGBackend:
                     )
                     return
                 
-                # Clean paths - remove extra quotes that might come from frontend
-                cleaned_paths = []
-                for path in file_paths:
-                    if isinstance(path, str):
-                        # Remove surrounding quotes if present
-                        cleaned_path = path.strip('"').strip("'")
-                        cleaned_paths.append(cleaned_path)
-                        logger.info(f"Cleaned path: {path} -> {cleaned_path}")
-                    else:
-                        cleaned_paths.append(path)
+                # Clean paths - remove surrounding quotes that might come from frontend
+                cleaned_paths = [path.strip(_PATH_QUOTES) if isinstance(path, str) else path for path in file_paths]
+                if logger.isEnabledFor(logging.DEBUG):
+                    for path, cleaned_path in zip(file_paths, cleaned_paths):
+                        logger.debug("Cleaned path: %s -> %s", path, cleaned_path)
+                logger.info("Cleaned %d paths", len(cleaned_paths))
                 
                 # Initialize per-file progress tracking
                 file_progress = self._initialize_file_progress(processing_id, cleaned_paths)
-                logger.info(f"Initialized per-file progress for {len(file_progress)} files")
+                logger.info("Initialized per-file progress for %s files", len(file_progress))
                 
                 self._update_processing_status(
                     processing_id, 
@@ -671,7 +1110,7 @@ class FlexibleGraphRAGBackend:
                     file_progress=file_progress
                 )
                 
-                logger.info(f"Updated status with file_progress: {len(file_progress)} files")
+                logger.info("Updated status with file_progress: %s files", len(file_progress))
                 
                 # Check for cancellation before heavy processing
                 if self._is_processing_cancelled(processing_id):
@@ -682,85 +1121,10 @@ class FlexibleGraphRAGBackend:
                 
                 # Completion status is now sent by the callback from hybrid_system.py
                 # This ensures proper timing after all processing logs are written
-                logger.info(f"Batch processing method completed for {len(cleaned_paths)} files")
-                
-            elif data_source == "cmis":
-                self._update_processing_status(
-                    processing_id, 
-                    "processing", 
-                    "Connecting to CMIS repository...", 
-                    20
-                )
-                
-                # Check for cancellation before connecting
-                if self._is_processing_cancelled(processing_id):
-                    return
-                    
-                self._update_processing_status(
-                    processing_id, 
-                    "processing", 
-                    "Scanning CMIS repository for documents...", 
-                    40
-                )
+                logger.info("Batch processing method completed for %s files", len(cleaned_paths))
                 
-                self._update_processing_status(
-                    processing_id, 
-                    "processing", 
-                    "Downloading and processing CMIS documents...", 
-                    60
-                )
-                
-                cmis_config = kwargs.get('cmis_config')
-                if cmis_config:
-                    await self.system.ingest_cmis(cmis_config, processing_id=processing_id, status_callback=self._update_processing_status)
-                else:
-                    await self.system.ingest_cmis(processing_id=processing_id, status_callback=self._update_processing_status)
-                    
-                self._update_processing_status(
-                    processing_id, 
-                    "completed", 
-                    "Successfully ingested documents from CMIS repository!", 
-                    100
-                )
-                
-            elif data_source == "alfresco":
-                self._update_processing_status(
-                    processing_id, 
-                    "processing", 
-                    "Connecting to Alfresco repository...", 
-                    20
-                )
-                
-                # Check for cancellation before connecting
-                if self._is_processing_cancelled(processing_id):
-                    return
-                    
-                self._update_processing_status(
-                    processing_id, 
-                    "processing", 
-                    "Scanning Alfresco repository for documents...", 
-                    40
-                )
-                
-                self._update_processing_status(
-                    processing_id, 
-                    "processing", 
-                    "Downloading and processing Alfresco documents...", 
-                    60
-                )
-                
-                alfresco_config = kwargs.get('alfresco_config')
-                if alfresco_config:
-                    await self.system.ingest_alfresco(alfresco_config, processing_id=processing_id, status_callback=self._update_processing_status)
-                else:
-                    await self.system.ingest_alfresco(processing_id=processing_id, status_callback=self._update_processing_status)
-                    
-                self._update_processing_status(
-                    processing_id, 
-                    "completed", 
-                    "Successfully ingested documents from Alfresco repository!", 
-                    100
-                )
+            elif data_source in _REPOSITORY_SOURCES:
+                await self._ingest_repository(processing_id, data_source, job.source_config)
                 
             else:
                 self._update_processing_status(
@@ -771,12 +1135,12 @@ class FlexibleGraphRAGBackend:
                 )
                 
         except RuntimeError as e:
-            if "cancelled by user" in str(e):
-                logger.info(f"Processing {processing_id} was cancelled by user")
-                # Clean up any partial indexes that might have been created
-                await self._cleanup_partial_processing(processing_id)
+            if "cancelled by user" in str(e) or self._is_processing_cancelled(processing_id):
+                logger.info("Processing %s was cancelled by user", processing_id)
+                # Clean up any partial indexes in the background - the run already reads as cancelled
+                self._schedule_cleanup(processing_id)
             else:
-                logger.error(f"Runtime error in processing {processing_id}: {str(e)}")
+                logger.error("Runtime error in processing %s: %s", processing_id, e)
                 self._update_processing_status(
                     processing_id, 
                     "failed", 
@@ -785,17 +1149,20 @@ class FlexibleGraphRAGBackend:
                 )
         except Exception as e:
             # Handle LLM self-cancellation and timeout errors gracefully
-            error_str = str(e).lower()
-            if any(keyword in error_str for keyword in ['timeout', 'timed out', 'request timeout', 'connection timeout']):
-                logger.warning(f"LLM timeout in processing {processing_id}: {str(e)}")
+            error_str = str(e)
+            if self._is_processing_cancelled(processing_id):
+                logger.info("Processing %s was cancelled by user", processing_id)
+                self._schedule_cleanup(processing_id)
+            elif _TIMEOUT_ERROR_RE.search(error_str):
+                logger.warning("LLM timeout in processing %s: %s", processing_id, e)
                 self._update_processing_status(
                     processing_id, 
                     "failed", 
                     f"Processing timeout - LLM took too long to respond. Try increasing timeout or using smaller documents: {str(e)}", 
                     0
                 )
-            elif any(keyword in error_str for keyword in ['cancelled', 'aborted', 'interrupted']):
-                logger.warning(f"LLM self-cancelled in processing {processing_id}: {str(e)}")
+            elif _INTERRUPTED_ERROR_RE.search(error_str):
+                logger.warning("LLM self-cancelled in processing %s: %s", processing_id, e)
                 self._update_processing_status(
                     processing_id, 
                     "failed", 
@@ -803,7 +1170,7 @@ class FlexibleGraphRAGBackend:
                     0
                 )
             else:
-                logger.error(f"Error ingesting documents {processing_id}: {str(e)}")
+                logger.error("Error ingesting documents %s: %s", processing_id, e)
                 self._update_processing_status(
                     processing_id, 
                     "failed", 
@@ -811,14 +1178,81 @@ class FlexibleGraphRAGBackend:
                     0
                 )
     
-    async def search_documents(self, query: str, top_k: int = 10) -> Dict[str, Any]:
-        """Search documents using hybrid search"""
+    # Result caching
+    
+    def clear_cache(self) -> Dict[str, Any]:
+        """Invalidate cached search and query results"""
+        cleared = len(self._result_cache) + len(self._semantic_cache)
+        self._result_cache.clear()
+        self._semantic_cache.clear()
+        if cleared:
+            logger.info("Cleared %s cached search/query result(s)", cleared)
+        return {"success": True, "cleared": cleared}
+    
+    async def _cached_result(self, key: Tuple, bypass_cache: bool,
+                             compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Return a cached result for key, computing it once if missing"""
+        if bypass_cache:
+            return await compute()
+        
+        use_cache = self.settings.query_cache_size > 0
+        if use_cache:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # Join an identical request that is already running (works with the cache disabled too)
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
         try:
-            results = await self.system.search(query, top_k=top_k)
-            return {"success": True, "results": results}
+            result = await compute()
+            if use_cache and result.get("success"):
+                self._result_cache[key] = result
+            future.set_result(result)
+            return result
         except Exception as e:
-            logger.error(f"Error during search: {str(e)}")
-            return {"success": False, "error": str(e)}
+            future.set_exception(e)
+            future.exception()  # mark retrieved - the caller gets the exception directly
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+    
+    async def search_documents(self, query: str, top_k: int = 10, bypass_cache: bool = False) -> Dict[str, Any]:
+        """Search documents using hybrid search"""
+        async def _search():
+            try:
+                results = await self.system.search(query, top_k=top_k)
+                return {"success": True, "results": results}
+            except Exception as e:
+                logger.error("Error during search: %s", e)
+                return {"success": False, "error": str(e)}
+        
+        return await self._cached_result(("s", query.strip().lower(), top_k), bypass_cache, _search)
+    
+    async def search_and_answer(self, query: str, top_k: int = 10, bypass_cache: bool = False) -> Dict[str, Any]:
+        """Search documents and answer the query from a single retrieval pass"""
+        search_key = ("s", query.strip().lower(), top_k)
+        
+        async def _search_and_answer():
+            try:
+                result = await self.system.search_and_answer(query, top_k=top_k)
+                # The hit list doubles as a search result for follow-up search_documents calls
+                if self.settings.query_cache_size > 0:
+                    self._result_cache[search_key] = {"success": True, "results": result["results"]}
+                return {"success": True, "answer": result["answer"], "results": result["results"]}
+            except Exception as e:
+                logger.error("Error during search and answer: %s", e)
+                return {"success": False, "error": str(e)}
+        
+        return await self._cached_result(("sa",) + search_key[1:], bypass_cache, _search_and_answer)
     
     async def qa_query(self, query: str) -> Dict[str, Any]:
         """Answer a question using the Q&A system"""
@@ -829,25 +1263,82 @@ class FlexibleGraphRAGBackend:
             logger.info("Using async query method (aquery) for all LLM providers")
             response = await query_engine.aquery(query)
             
-            answer = str(response)
+            from hybrid_system import answer_text
+            answer = answer_text(response)
             return {"success": True, "answer": answer}
         except Exception as e:
-            logger.error(f"Error during Q&A query: {str(e)}")
+            logger.error("Error during Q&A query: %s", e)
             return {"success": False, "error": str(e)}
     
-    async def query_documents(self, query: str, top_k: int = 10) -> Dict[str, Any]:
+    async def query_documents(self, query: str, top_k: int = 10, bypass_cache: bool = False) -> Dict[str, Any]:
         """Query documents with AI-generated answers"""
-        try:
-            query_engine = self.system.get_query_engine()
-            
-            # Use async methods as recommended by LlamaIndex error message
-            logger.info("Using async query method (aquery) for all LLM providers")
-            response = await query_engine.aquery(query)
-            
-            return {"success": True, "answer": str(response)}
-        except Exception as e:
-            logger.error(f"Error during query: {str(e)}")
-            return {"success": False, "error": str(e)}
+        async def _query():
+            try:
+                # Paraphrased questions can reuse an answer via embedding similarity
+                query_embedding = None
+                if not bypass_cache and self.settings.semantic_cache_size > 0:
+                    try:
+                        query_embedding = await self.system.embed_model.aget_query_embedding(query)
+                        cached = self._semantic_cache.lookup(query_embedding)
+                        if cached is not None:
+                            logger.info("Semantic cache hit for query")
+                            return cached
+                    except Exception as e:
+                        logger.warning("Semantic cache lookup skipped: %s", e)
+                        query_embedding = None
+                
+                query_engine = self.system.get_query_engine()
+                
+                # Use async methods as recommended by LlamaIndex error message
+                logger.info("Using async query method (aquery) for all LLM providers")
+                response = await query_engine.aquery(query)
+                
+                from hybrid_system import answer_text
+                result = {"success": True, "answer": answer_text(response)}
+                if query_embedding is not None:
+                    self._semantic_cache.add(query_embedding, result)
+                return result
+            except Exception as e:
+                logger.error("Error during query: %s", e)
+                return {"success": False, "error": str(e)}
+        
+        return await self._cached_result(("q", query.strip().lower(), top_k), bypass_cache, _query)
+    
+    async def stream_query(self, query: str, top_k: int = 10, bypass_cache: bool = False) -> AsyncIterator[str]:
+        """Yield the answer to a query as the LLM generates it (shares the query_documents cache)"""
+        key = ("q", query.strip().lower(), top_k)
+        use_cache = not bypass_cache and self.settings.query_cache_size > 0
+        cached = self._result_cache.get(key) if use_cache else None
+        if cached is not None:
+            yield cached["answer"]
+            return
+        
+        query_engine = self.system.get_query_engine(streaming=True)
+        response = await query_engine.aquery(query)
+        if not hasattr(response, "async_response_gen"):
+            # Older LlamaIndex versions only stream synchronously - send the answer in one piece
+            answer = str(response)
+            yield answer
+        else:
+            tokens = []
+            async for token in response.async_response_gen():
+                tokens.append(token)
+                yield token
+            answer = "".join(tokens)
+        
+        if use_cache:
+            self._result_cache[key] = {"success": True, "answer": answer}
+    
+    async def ingest_text_stream(self, chunks: AsyncIterable[bytes], source_name: str = "text_input") -> Dict[str, Any]:
+        """Start async ingestion of UTF-8 text received in chunks (e.g. a streamed request body)"""
+        # The sentence splitter works on the whole document, so the text is still assembled -
+        # but without the raw body, JSON-decoded and request-model copies of the JSON endpoint
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        text = io.StringIO()
+        async for chunk in chunks:
+            text.write(decoder.decode(chunk))
+        text.write(decoder.decode(b"", final=True))
+        return await self.ingest_text(text.getvalue(), source_name)
     
     async def ingest_text(self, content: str, source_name: str = "text_input") -> Dict[str, Any]:
         """Start async text ingestion and return processing ID"""
@@ -862,7 +1353,7 @@ class FlexibleGraphRAGBackend:
         )
         
         # Start background task
-        asyncio.create_task(self._process_text_async(processing_id, content, source_name))
+        self._start_task(self._process_text_async(processing_id, content, source_name), self._background_tasks)
         
         estimated_time = self._estimate_processing_time(content=content)
         
@@ -883,36 +1374,9 @@ class FlexibleGraphRAGBackend:
                 10
             )
             
-            self._update_processing_status(
-                processing_id, 
-                "processing", 
-                "Processing text and generating embeddings...", 
-                30
-            )
-            
-            self._update_processing_status(
-                processing_id, 
-                "processing", 
-                "Building vector index...", 
-                50
-            )
-            
-            self._update_processing_status(
-                processing_id, 
-                "processing", 
-                "Extracting knowledge graph...", 
-                70
-            )
-            
-            self._update_processing_status(
-                processing_id, 
-                "processing", 
-                "Creating graph index and relationships...", 
-                85
-            )
-            
-            # Actual processing with cancellation support
-            await self.system.ingest_text(content=content, source_name=source_name, processing_id=processing_id)
+            # Actual processing with cancellation support - stage updates come from the pipeline itself
+            await self.system.ingest_text(content=content, source_name=source_name, processing_id=processing_id,
+                                          status_callback=self._update_processing_status)
             
             self._update_processing_status(
                 processing_id, 
@@ -923,11 +1387,11 @@ class FlexibleGraphRAGBackend:
             
         except RuntimeError as e:
             if "cancelled by user" in str(e):
-                logger.info(f"Text processing {processing_id} was cancelled by user")
-                # Clean up any partial indexes that might have been created
-                await self._cleanup_partial_processing(processing_id)
+                logger.info("Text processing %s was cancelled by user", processing_id)
+                # Clean up any partial indexes in the background - the run already reads as cancelled
+                self._schedule_cleanup(processing_id)
             else:
-                logger.error(f"Runtime error in text processing {processing_id}: {str(e)}")
+                logger.error("Runtime error in text processing %s: %s", processing_id, e)
                 self._update_processing_status(
                     processing_id, 
                     "failed", 
@@ -935,7 +1399,7 @@ class FlexibleGraphRAGBackend:
                     0
                 )
         except Exception as e:
-            logger.error(f"Error ingesting text {processing_id}: {str(e)}")
+            logger.error("Error ingesting text %s: %s", processing_id, e)
             self._update_processing_status(
                 processing_id, 
                 "failed", 
@@ -945,46 +1409,42 @@ class FlexibleGraphRAGBackend:
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get current system status without triggering database initialization"""
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < STATUS_CACHE_TTL:
+            return self._status_cache[1]
         try:
             # Return status without initializing databases to avoid APOC calls
-            return {
+            system = self._system
+            result = {
                 "success": True, 
                 "status": {
-                    "has_vector_index": self._system is not None and self._system.vector_index is not None,
-                    "has_graph_index": self._system is not None and self._system.graph_index is not None,
-                    "has_hybrid_retriever": self._system is not None and self._system.hybrid_retriever is not None,
-                    "config": {
-                        "data_source": self.settings.data_source,
-                        "vector_db": self.settings.vector_db,
-                        "graph_db": self.settings.graph_db,
-                        "search_db": self.settings.search_db,
-                        "llm_provider": self.settings.llm_provider
-                    },
-                    "system_initialized": self._system is not None
+                    "has_vector_index": system is not None and system.vector_index is not None,
+                    "has_graph_index": system is not None and system.graph_index is not None,
+                    "has_hybrid_retriever": system is not None and system.hybrid_retriever is not None,
+                    "config": self._config_snapshot,
+                    "system_initialized": system is not None
                 }
             }
+            self._status_cache = (now, result)
+            return result
         except Exception as e:
-            logger.error(f"Error getting status: {str(e)}")
+            logger.error("Error getting status: %s", e)
             return {"success": False, "error": str(e)}
     
     def get_config(self) -> Dict[str, Any]:
         """Get current configuration"""
-        return {
-            "success": True,
-            "config": {
-                "data_source": self.settings.data_source,
-                "vector_db": self.settings.vector_db,
-                "graph_db": self.settings.graph_db,
-                "llm_provider": self.settings.llm_provider
-            }
-        }
+        return {"success": True, "config": self._config_snapshot}
     
     def health_check(self) -> Dict[str, Any]:
         """Health check"""
-        return {"success": True, "status": "ok"}
+        return _HEALTH_OK
     
     def _generate_completion_message(self, doc_count: int) -> str:
         """Generate dynamic completion message based on enabled features"""
+        return f"Successfully ingested {doc_count} document(s)!{self._completion_suffix}"
+    
+    def _build_completion_suffix(self) -> str:
+        """Describe the enabled features for completion messages (settings are fixed, so built once)"""
         # Check what's actually enabled
         has_vector = str(self.settings.vector_db) != "none"
         has_graph = str(self.settings.graph_db) != "none" and self.settings.enable_knowledge_graph
@@ -1002,20 +1462,22 @@ class FlexibleGraphRAGBackend:
             else:
                 features.append(f"{self.settings.search_db} search")
         
-        # Create appropriate message
+        # Create appropriate message suffix
         if features:
             feature_text = " and ".join(features)
-            return f"Successfully ingested {doc_count} document(s)! {feature_text.title()} ready."
+            return f" {feature_text.title()} ready."
         else:
             # Fallback (shouldn't happen due to validation)
-            return f"Successfully ingested {doc_count} document(s)!"
+            return ""
 
-# Global backend instance
-_backend_instance = None
+_backend: Optional[FlexibleGraphRAGBackend] = None
+_backend_lock = threading.Lock()
 
 def get_backend() -> FlexibleGraphRAGBackend:
-    """Get the global backend instance"""
-    global _backend_instance
-    if _backend_instance is None:
-        _backend_instance = FlexibleGraphRAGBackend()
-    return _backend_instance
\ No newline at end of file
+    """Get the global backend instance (lock only taken until it exists)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = FlexibleGraphRAGBackend()
+    return _backend
\ No newline at end of file
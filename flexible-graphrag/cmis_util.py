@@ -1,69 +1,274 @@
+import asyncio
+import hashlib
+import io
+import json
 import cmislib
 from cmislib import CmisClient, Repository
 import logging
 import tempfile
 import os
-from typing import Callable, Awaitable, List, Any
+from typing import Callable, Awaitable, BinaryIO, Dict, List, Any, Optional, Set, Tuple, Union
+
+from sources import copy_stream, DOWNLOAD_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Documents processed at the same time when no concurrency is given (see Settings.cmis_concurrency)
+DEFAULT_CONCURRENCY = 4
+# Downloaded documents queued ahead of processing
+PREFETCH_DOCUMENTS = 2
+
+# Document content handed to the callback: a temp file path, or an in-memory stream for small PDFs
+DocumentContent = Union[str, BinaryIO]
+
+class _HashingWriter:
+    """File wrapper that feeds everything written through it into a hash"""
+
+    def __init__(self, file, hasher):
+        self.file = file
+        self.hasher = hasher
+
+    def write(self, chunk) -> int:
+        self.hasher.update(chunk)
+        return self.file.write(chunk)
+
+def _discard_content(content: DocumentContent) -> None:
+    """Release downloaded content - temp files are deleted, streams closed"""
+    if isinstance(content, str):
+        os.unlink(content)
+    else:
+        content.close()
+
 class CMISHandler:
-    def __init__(self, url: str, username: str, password: str):
-        """Initialize CMIS client and repository connection"""
-        try:
-            self.client = CmisClient(url, username, password)
-            self.repo = self.client.getDefaultRepository()
-            logger.info("Successfully connected to CMIS repository")
-        except Exception as e:
-            logger.error(f"Failed to connect to CMIS repository: {str(e)}")
-            raise
+    def __init__(self, url: str, username: str, password: str, dedup_path: Optional[str] = None,
+                 repo: Optional[Repository] = None, dedup_scope: str = ""):
+        """Initialize CMIS client and repository connection
+
+        dedup_path, if given, is a JSON file remembering the content hashes of processed
+        documents across runs, so identical PDFs are not sent to the callback again.
+        dedup_scope names the processing configuration (e.g. schema and LLM) hashes are recorded
+        under, so changing it processes unchanged documents again.
+        repo, if given, is an already connected repository to reuse instead of connecting again.
+        """
+        if repo is not None:
+            self.repo = repo
+        else:
+            try:
+                self.client = CmisClient(url, username, password)
+                self.repo = self.client.getDefaultRepository()
+                logger.info("Successfully connected to CMIS repository")
+            except Exception as e:
+                logger.error(f"Failed to connect to CMIS repository: {str(e)}")
+                raise
+        
+        # SHA-256 of processed content (qualified by dedup_scope) -> object id it was processed as
+        self.dedup_path = dedup_path
+        self.dedup_scope = dedup_scope
+        self._seen_digests: Dict[str, str] = {}
+        if dedup_path and os.path.exists(dedup_path):
+            with open(dedup_path, 'r', encoding='utf-8') as f:
+                self._seen_digests = json.load(f)
+        # Hashes of documents downloaded or being processed in this run - only persisted once processed
+        self._claimed_digests: Set[str] = set()
 
     async def process_folder(
         self, 
         folder_path: str, 
-        process_doc_callback: Callable[[str, str, str], Awaitable[None]]
+        process_doc_callback: Callable[[str, str, DocumentContent], Awaitable[None]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        in_memory_limit: int = 0
     ) -> None:
-        """Process all documents in a folder one at a time"""
+        """Process all PDF documents in a folder, up to `concurrency` at a time while the next ones download
+
+        The callback gets a temporary file path, or - for PDFs no larger than in_memory_limit bytes
+        (0 disables this) - a BytesIO, so callbacks must accept both before setting a limit.
+        """
         logger.info(f"Accessing folder: {folder_path}")
         try:
-            folder = self.repo.getObjectByPath(folder_path)
+            # cmislib calls are blocking HTTP requests - keep them off the event loop
+            folder = await asyncio.to_thread(self.repo.getObjectByPath, folder_path)
             if not folder:
                 logger.error(f"Folder not found: {folder_path}")
                 raise ValueError(f"Folder not found: {folder_path}")
 
-            # Get all children of the folder
-            logger.info("Retrieving folder contents...")
-            children: List[Any] = folder.getChildren()
+            # Let the server pick out the PDF documents instead of fetching every child
+            logger.info("Querying folder for PDF documents...")
+            documents: List[Any] = await asyncio.to_thread(self._query_pdf_documents, folder.getObjectId())
             
-            # Process each document
-            for child in children:
-                try:
-                    if child.properties['cmis:baseTypeId'] == 'cmis:document':
-                        doc_name = child.getName()
-                        doc_id = child.getObjectId()
-                        
-                        # Check if it's a PDF document
-                        content_type = child.properties.get('cmis:contentStreamMimeType', '').lower()
-                        if not content_type.endswith('pdf'):
-                            logger.info(f"Skipping non-PDF document: {doc_name} (type: {content_type})")
-                            continue
-                            
-                        logger.info(f"Processing PDF document: {doc_name}")
-                        
-                        # Save PDF content to temporary file
-                        content = child.getContentStream().read()
-                        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                            temp_file.write(content)
-                            temp_file_path = temp_file.name
-                        
-                        await process_doc_callback(doc_id, doc_name, temp_file_path)
-                        logger.info(f"Successfully processed document: {doc_name}")
-                        
-                        # Clean up temporary file
-                        os.unlink(temp_file_path)
-                except Exception as e:
-                    logger.error(f"Error processing child: {str(e)}")
-                    continue
+            await self.process_documents(documents, process_doc_callback, concurrency, in_memory_limit)
         except Exception as e:
             logger.error(f"Error accessing folder {folder_path}: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    async def process_documents(
+        self,
+        documents: List[Any],
+        process_doc_callback: Callable[[str, str, DocumentContent], Awaitable[None]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        in_memory_limit: int = 0
+    ) -> None:
+        """Process already listed CMIS documents (e.g. from a folder listing) like process_folder does
+
+        Documents are downloaded in order; a document whose download or callback fails is logged
+        and skipped without stopping the others.
+        """
+        await self._run_pipeline(documents, process_doc_callback, max(1, concurrency), in_memory_limit)
+
+    def _query_pdf_documents(self, folder_id: str) -> List[Any]:
+        """Query the PDF documents directly inside a folder (id, name and size only)"""
+        folder_id = folder_id.replace("'", "\\'")
+        results = self.repo.query(
+            "SELECT cmis:objectId, cmis:name, cmis:contentStreamLength FROM cmis:document "
+            f"WHERE IN_FOLDER('{folder_id}') AND cmis:contentStreamMimeType = 'application/pdf'"
+        )
+        return list(results)
+
+    async def _run_pipeline(
+        self,
+        documents: List[Any],
+        process_doc_callback: Callable[[str, str, DocumentContent], Awaitable[None]],
+        workers: int,
+        in_memory_limit: int
+    ) -> None:
+        """Download documents ahead of the workers running the callback, so downloads overlap processing"""
+        # Bounded so only a couple of downloaded PDFs wait on disk beyond the ones being processed
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_DOCUMENTS)
+
+        def _release(item: Tuple[str, str, DocumentContent, str]) -> None:
+            _discard_content(item[2])
+            self._claimed_digests.discard(item[3])
+
+        def _discard_download(download: asyncio.Future) -> None:
+            # A cancelled run's download thread finishes on its own - remove what it wrote
+            if not download.cancelled() and download.exception() is None and download.result() is not None:
+                _discard_content(download.result()[2])
+
+        async def _producer() -> None:
+            try:
+                for document in documents:
+                    download = asyncio.ensure_future(self._download_document(document, in_memory_limit))
+                    try:
+                        item = await asyncio.shield(download)
+                    except asyncio.CancelledError:
+                        download.add_done_callback(_discard_download)
+                        raise
+                    if item is None:
+                        continue
+                    doc_id, doc_name, content, digest = item
+                    if digest in self._seen_digests:
+                        # Same content was already processed (possibly under another object id)
+                        logger.info(f"Skipping duplicate document: {doc_name} (same content as {self._seen_digests[digest]})")
+                        _discard_content(content)
+                        continue
+                    if digest in self._claimed_digests:
+                        logger.info(f"Skipping duplicate document: {doc_name} (same content is already being processed)")
+                        _discard_content(content)
+                        continue
+                    # Claimed now so duplicates later in this folder are skipped too
+                    self._claimed_digests.add(digest)
+                    try:
+                        await queue.put(item)
+                    except asyncio.CancelledError:
+                        _release(item)
+                        raise
+            finally:
+                # One end marker per worker, even if the producer fails, so no worker waits forever
+                for _ in range(workers):
+                    await queue.put(None)
+
+        async def _worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                await self._process_downloaded(item, process_doc_callback)
+
+        tasks = [asyncio.ensure_future(_producer())] + [asyncio.ensure_future(_worker()) for _ in range(workers)]
+        try:
+            # Each document handles its own errors, so one failure does not stop the others;
+            # a producer error still surfaces here once the workers have drained the queue
+            await asyncio.gather(*tasks)
+        finally:
+            # On cancellation or a fatal error, stop whatever is still running and wait for it
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Remove downloads no worker picked up (only left behind on cancellation)
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None:
+                    _release(item)
+
+    async def _download_document(self, document: Any,
+                                 in_memory_limit: int) -> Optional[Tuple[str, str, DocumentContent, str]]:
+        """Download one document, returning (id, name, content, dedup key) or None on failure"""
+        try:
+            doc_id = document.properties['cmis:objectId']
+            doc_name = document.properties['cmis:name']
+            size = document.properties.get('cmis:contentStreamLength')
+            in_memory = in_memory_limit > 0 and size is not None and int(size) <= in_memory_limit
+            # cmislib is synchronous - download in a worker thread so the event loop keeps going
+            suffix = os.path.splitext(doc_name)[1] or '.pdf'
+            content, digest = await asyncio.to_thread(self._download_content, doc_id, in_memory, suffix)
+            return doc_id, doc_name, content, self._dedup_key(digest)
+        except Exception as e:
+            logger.error(f"Error downloading document: {str(e)}")
+            return None
+
+    async def _process_downloaded(
+        self,
+        item: Tuple[str, str, DocumentContent, str],
+        process_doc_callback: Callable[[str, str, DocumentContent], Awaitable[None]]
+    ) -> None:
+        """Hand a downloaded document to the callback and release its content"""
+        doc_id, doc_name, content, digest = item
+        try:
+            logger.info(f"Processing PDF document: {doc_name}")
+            await process_doc_callback(doc_id, doc_name, content)
+            logger.info(f"Successfully processed document: {doc_name}")
+            self._seen_digests[digest] = doc_id
+            self._save_seen_digests()
+        except Exception as e:
+            logger.error(f"Error processing document {doc_name}: {str(e)}")
+        finally:
+            # Released on failure or cancellation too, so a later run (or duplicate) can try again
+            self._claimed_digests.discard(digest)
+            # Clean up the temporary file or in-memory copy
+            _discard_content(content)
+
+    def _dedup_key(self, digest: str) -> str:
+        """Key a content hash by the processing configuration it applies to"""
+        return f"{digest}:{self.dedup_scope}" if self.dedup_scope else digest
+
+    def _save_seen_digests(self) -> None:
+        """Persist processed content hashes when a dedup file is configured"""
+        if not self.dedup_path:
+            return
+        try:
+            with open(self.dedup_path, 'w', encoding='utf-8') as f:
+                json.dump(self._seen_digests, f)
+        except OSError as e:
+            logger.warning(f"Could not save processed document hashes to {self.dedup_path}: {str(e)}")
+
+    def _download_content(self, doc_id: str, in_memory: bool, suffix: str = '.pdf') -> Tuple[DocumentContent, str]:
+        """Stream a document's content into memory or a temporary file, returning it and its SHA-256"""
+        stream = self.repo.getObject(doc_id).getContentStream()
+        hasher = hashlib.sha256()
+        try:
+            if in_memory:
+                content = io.BytesIO()
+                copy_stream(stream, _HashingWriter(content, hasher), bytearray(DOWNLOAD_CHUNK_SIZE))
+                content.seek(0)
+                return content, hasher.hexdigest()
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+                try:
+                    # Copy in chunks so a large PDF is never held in memory as a whole
+                    copy_stream(stream, _HashingWriter(temp_file, hasher), bytearray(DOWNLOAD_CHUNK_SIZE))
+                except BaseException:
+                    # Don't leave partial downloads behind in the temp directory
+                    temp_file.close()
+                    os.unlink(temp_file.name)
+                    raise
+                return temp_file.name, hasher.hexdigest()
+        finally:
+            stream.close()
@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import Field, field_validator
+from functools import lru_cache
+from pydantic import Field, PrivateAttr, field_validator, model_validator
 from pydantic_settings import BaseSettings
 from typing import List, Optional, Dict, Any, Literal
 import os
@@ -93,6 +94,18 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
     chunk_size: int = 1024
     chunk_overlap: int = 128
     max_triplets_per_chunk: int = 10
+    ingest_concurrency: int = Field(4, description="Maximum number of files converted concurrently during document ingestion (each with its own Docling converter)")
+    cmis_concurrency: int = Field(4, description="Maximum number of CMIS documents converted while the next ones download")
+    cmis_memory_download_limit: int = Field(20 * 1024 * 1024, description="CMIS documents up to this many bytes are converted from memory instead of a temp file (0 disables)")
+    cmis_dedup_path: Optional[str] = Field(None, description="JSON file recording content hashes of ingested CMIS documents, so unchanged documents are skipped on later runs")
+    ui_progress_delay_ms: int = Field(0, description="Artificial delay between per-file progress phases so UIs can show each step (0 disables)")
+    allow_nested_loops: bool = Field(False, description="Apply nest_asyncio on the stdlib event loop (for notebooks); uvloop is used when disabled")
+    
+    # Search/query result cache
+    query_cache_size: int = Field(1024, description="Maximum number of cached search/query results (0 disables caching)")
+    query_cache_ttl: int = Field(300, description="Seconds a cached search/query result stays valid")
+    semantic_cache_size: int = Field(2000, description="Maximum number of query answers cached by embedding similarity (0 disables)")
+    semantic_cache_threshold: float = Field(0.95, description="Minimum cosine similarity for a paraphrased query to reuse a cached answer")
     
     # Document processing timeouts (in seconds) - DIFFERENT from LLM timeouts
     docling_timeout: int = Field(300, description="Timeout for single document Docling conversion in seconds (default: 5 minutes) - separate from LLM request timeouts")
@@ -104,10 +117,12 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
     kg_batch_size: int = Field(10, description="Number of chunks to process in each batch during KG extraction")
     kg_cancel_check_interval: float = Field(2.0, description="How often to check for cancellation during KG extraction in seconds")
     
-    # Environment-based defaults
-    def __init__(self, **data):
-        super().__init__(**data)
-        
+    # Named schemas indexed by name, built for the current `schemas` list on first lookup
+    _schema_index: Optional[tuple] = PrivateAttr(default=None)
+    
+    # Environment-based defaults (after validation, so only configs left empty are filled in)
+    @model_validator(mode="after")
+    def apply_environment_defaults(self) -> "Settings":
         # Set default LLM config based on provider if not provided
         if not self.llm_config:
             if self.llm_provider == LLMProvider.OPENAI:
@@ -115,6 +130,7 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
                     "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
                     "api_key": os.getenv("OPENAI_API_KEY"),
                     "embedding_model": "text-embedding-3-small",
+                    "embed_batch_size": int(os.getenv("EMBED_BATCH_SIZE", "100")),
                     "temperature": 0.1,
                     "max_tokens": 4000,
                     "timeout": float(os.getenv("OPENAI_TIMEOUT", "120.0"))
@@ -124,6 +140,7 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
                     "model": os.getenv("OLLAMA_MODEL", "llama3.1:8b"),
                     "base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
                     "embedding_model": "mxbai-embed-large",
+                    "embed_batch_size": int(os.getenv("EMBED_BATCH_SIZE", "10")),
                     "temperature": 0.1,
                     "timeout": float(os.getenv("OLLAMA_TIMEOUT", "300.0"))  # Higher default for local processing
                 }
@@ -134,6 +151,7 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
                     "azure_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
                     "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
                     "api_version": os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+                    "embed_batch_size": int(os.getenv("EMBED_BATCH_SIZE", "100")),
                     "temperature": 0.1,
                     "timeout": float(os.getenv("AZURE_OPENAI_TIMEOUT", "120.0"))
                 }
@@ -212,6 +230,8 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
                     "password": os.getenv("ELASTICSEARCH_PASSWORD"),
                     "embed_dim": 1536 if self.llm_provider == LLMProvider.OPENAI else 1024  # Ollama compatibility
                 }
+        
+        return self
     
     def get_active_schema(self) -> Optional[Dict[str, Any]]:
         """Get the currently active schema based on schema_name"""
@@ -220,10 +240,17 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
         elif self.schema_name == "default":
             return SAMPLE_SCHEMA
         else:
-            # Look for named schema in schemas array
-            for schema_def in self.schemas:
-                if schema_def.get("name") == self.schema_name:
-                    return schema_def.get("schema", {})
+            # Look for named schema in schemas array (indexed once - rebuilt if the list is replaced)
+            if self._schema_index is None or self._schema_index[0] is not self.schemas:
+                index = {}
+                for schema_def in self.schemas:
+                    if schema_def.get("name"):
+                        # First definition wins, as with the previous linear scan
+                        index.setdefault(schema_def["name"], schema_def.get("schema", {}))
+                self._schema_index = (self.schemas, index)
+            schema = self._schema_index[1].get(self.schema_name)
+            if schema is not None:
+                return schema
             
             # If named schema not found, log warning and return None
             import logging
@@ -238,6 +265,11 @@ an aristocratic family that rules the planet Caladan, the rainy planet, since 10
         "extra": "allow"
     }
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings (environment and .env are parsed once)"""
+    return Settings()
+
 # Sample schema configuration
 SAMPLE_SCHEMA = {
     "entities": Literal["PERSON", "ORGANIZATION", "LOCATION", "TECHNOLOGY", "PROJECT", "DOCUMENT"],
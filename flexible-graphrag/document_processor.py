@@ -1,10 +1,11 @@
 import asyncio
+import queue
 from pathlib import Path
-from typing import List, Union
+from typing import BinaryIO, Callable, List, Optional, Union
 import logging
 
 from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.datamodel.base_models import InputFormat
+from docling.datamodel.base_models import DocumentStream, InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions, TableStructureOptions
 from llama_index.core import Document
 
@@ -14,6 +15,19 @@ class DocumentProcessor:
     """Handles document conversion using Docling before LlamaIndex processing"""
     
     def __init__(self, config=None):
+        # Store configuration for timeouts
+        self.config = config
+        
+        # Docling converters are not known to be thread-safe, so each concurrent conversion takes
+        # one out of this pool - more are created on demand, up to one per conversion thread
+        self._idle_converters: "queue.SimpleQueue[DocumentConverter]" = queue.SimpleQueue()
+        self._idle_converters.put(self._create_converter())
+        
+        logger.info("DocumentProcessor initialized with Docling converter")
+    
+    @staticmethod
+    def _create_converter() -> DocumentConverter:
+        """Build a Docling converter for all supported formats"""
         # Configure Docling for optimal PDF processing
         pdf_options = PdfPipelineOptions(
             do_table_structure=True,
@@ -25,7 +39,7 @@ class DocumentProcessor:
         )
         
         # Configure all supported Docling formats
-        self.converter = DocumentConverter(
+        return DocumentConverter(
             allowed_formats=[
                 InputFormat.PDF,
                 InputFormat.DOCX, 
@@ -41,11 +55,17 @@ class DocumentProcessor:
                 InputFormat.PDF: PdfFormatOption(pipeline_options=pdf_options)
             }
         )
-        
-        # Store configuration for timeouts
-        self.config = config
-        
-        logger.info("DocumentProcessor initialized with Docling converter")
+    
+    def _convert(self, source):
+        """Run one Docling conversion (in an executor thread) on a converter no other thread is using"""
+        try:
+            converter = self._idle_converters.get_nowait()
+        except queue.Empty:
+            converter = self._create_converter()
+        try:
+            return converter.convert(source)
+        finally:
+            self._idle_converters.put(converter)
     
     async def _run_with_cancellation_checks(self, loop, func, check_cancellation, timeout=None):
         """Run a function in executor with periodic cancellation checks"""
@@ -83,139 +103,181 @@ class DocumentProcessor:
         
         return await future
     
-    async def process_documents(self, file_paths: List[Union[str, Path]], processing_id: str = None) -> List[Document]:
-        """Convert documents to markdown using Docling, then create LlamaIndex Documents"""
-        documents = []
+    async def process_documents(self, file_paths: List[Union[str, Path]], processing_id: str = None,
+                                file_callback: Callable[[int, bool], None] = None) -> List[Document]:
+        """Convert documents to markdown using Docling, then create LlamaIndex Documents
         
-        # Helper function to check cancellation
+        file_callback, if given, is called with (file index, converted) as each file finishes.
+        """
+        _check_cancellation = self._cancellation_check(processing_id)
+        
+        # Convert files concurrently (bounded) so I/O and executor work overlaps across files
+        concurrency = max(1, getattr(self.config, "ingest_concurrency", 1) or 1)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _bounded(file_index, file_path):
+            async with semaphore:
+                document = await self._process_single_document(file_path, _check_cancellation)
+            if file_callback:
+                file_callback(file_index, document is not None)
+            return document
+        
+        tasks = [asyncio.ensure_future(_bounded(i, file_path)) for i, file_path in enumerate(file_paths)]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop sibling conversions on cancellation or unexpected failure
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        # gather preserves input order, so documents stay in file_paths order
+        documents = [doc for doc in results if doc is not None]
+        
+        logger.info(f"Successfully processed {len(documents)} documents")
+        return documents
+    
+    async def process_document(self, file_path: Union[str, Path], processing_id: str = None,
+                               stream: Optional[BinaryIO] = None) -> Optional[Document]:
+        """Convert one file (e.g. a repository download as it arrives), or None if it is skipped or fails
+        
+        With a stream, the content is read from it and file_path is only the document's name.
+        """
+        return await self._process_single_document(file_path, self._cancellation_check(processing_id), stream)
+    
+    @staticmethod
+    def _cancellation_check(processing_id: Optional[str]) -> Callable[[], bool]:
+        """Return a function telling whether the given processing run was cancelled"""
         def _check_cancellation():
             if processing_id:
                 try:
                     from backend import PROCESSING_STATUS
-                    return (processing_id in PROCESSING_STATUS and 
-                            PROCESSING_STATUS[processing_id]["status"] == "cancelled")
+                    record = PROCESSING_STATUS.get(processing_id)
+                    return record is not None and record["status"] == "cancelled"
                 except ImportError:
                     return False
             return False
-        
-        for file_path in file_paths:
-            # Check for cancellation before processing each file
-            if _check_cancellation():
-                logger.info("Document processing cancelled by user")
-                raise RuntimeError("Processing cancelled by user")
-            try:
-                path_obj = Path(file_path)
+        return _check_cancellation
+    
+    async def _process_single_document(self, file_path: Union[str, Path], _check_cancellation,
+                                       stream: Optional[BinaryIO] = None) -> Optional[Document]:
+        """Convert a single file into a LlamaIndex Document, or None if it is skipped or fails"""
+        # Check for cancellation before processing each file
+        if _check_cancellation():
+            logger.info("Document processing cancelled by user")
+            raise RuntimeError("Processing cancelled by user")
+        try:
+            path_obj = Path(file_path)
+            
+            # Check if file exists (in-memory content has no file)
+            if stream is None and not path_obj.exists():
+                logger.warning(f"File does not exist: {file_path}")
+                return None
+            
+            # Check if it's a supported file type by Docling
+            docling_extensions = [
+                '.pdf', '.docx', '.xlsx', '.pptx',
+                '.html', '.htm', '.md', '.markdown', '.asciidoc', '.adoc',
+                '.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp', '.webp',
+                '.csv', '.xml', '.json'
+            ]
+            if path_obj.suffix.lower() in docling_extensions:
+                # Check for cancellation before heavy processing
+                if _check_cancellation():
+                    logger.info("Document processing cancelled before Docling conversion")
+                    raise RuntimeError("Processing cancelled by user")
                 
-                # Check if file exists
-                if not path_obj.exists():
-                    logger.warning(f"File does not exist: {file_path}")
-                    continue
+                logger.info(f"Converting document with Docling: {file_path}")
                 
-                # Check if it's a supported file type by Docling
-                docling_extensions = [
-                    '.pdf', '.docx', '.xlsx', '.pptx',
-                    '.html', '.htm', '.md', '.markdown', '.asciidoc', '.adoc',
-                    '.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp', '.webp',
-                    '.csv', '.xml', '.json'
-                ]
-                if path_obj.suffix.lower() in docling_extensions:
-                    # Check for cancellation before heavy processing
-                    if _check_cancellation():
-                        logger.info("Document processing cancelled before Docling conversion")
-                        raise RuntimeError("Processing cancelled by user")
-                    
-                    logger.info(f"Converting document with Docling: {file_path}")
-                    
-                    # Convert using Docling with cancellation support and proper async handling
-                    import asyncio
-                    import functools
-                    import concurrent.futures
-                    
-                    try:
-                        loop = asyncio.get_running_loop()
-                    except RuntimeError:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                    convert_func = functools.partial(self.converter.convert, str(file_path))
-                    
-                    # Run with periodic cancellation checks using configured timeout
-                    try:
-                        result = await self._run_with_cancellation_checks(
-                            loop, convert_func, _check_cancellation
-                        )
-                    except concurrent.futures.TimeoutError:
-                        raise RuntimeError("Processing cancelled by user")
-                    
-                    # Final check for cancellation after Docling conversion
-                    if _check_cancellation():
-                        logger.info("Document processing cancelled after Docling conversion")
-                        raise RuntimeError("Processing cancelled by user")
-                    
-                    # Extract both markdown and plain text
-                    markdown_content = result.document.export_to_markdown()
-                    plain_text = result.document.export_to_text()
-                    
-                    # Smart format selection: use markdown if tables detected, otherwise plain text
-                    has_tables = "|" in markdown_content and "---" in markdown_content  # Simple table detection
-                    
-                    if has_tables:
-                        content_to_use = markdown_content
-                        format_used = "markdown (tables detected)"
-                    else:
-                        content_to_use = plain_text
-                        format_used = "plain text (better for entities)"
-                    
-                    logger.info(f"Using {format_used} for {file_path}")
-                    
-                    # Log content length for debugging
-                    logger.info(f"Docling extracted {len(content_to_use)} characters from {file_path}")
-                    logger.debug(f"First 200 chars: {content_to_use[:200]}...")
-                    
-                    # Create LlamaIndex Document
-                    doc = Document(
-                        text=content_to_use,
-                        metadata={
-                            "source": str(file_path),
-                            "conversion_method": "docling",
-                            "file_type": path_obj.suffix,
-                            "file_name": path_obj.name
-                        }
+                # Convert using Docling with cancellation support and proper async handling
+                import functools
+                import concurrent.futures
+                
+                loop = asyncio.get_running_loop()
+                source = DocumentStream(name=path_obj.name, stream=stream) if stream is not None else str(file_path)
+                convert_func = functools.partial(self._convert, source)
+                
+                # Run with periodic cancellation checks using configured timeout
+                try:
+                    result = await self._run_with_cancellation_checks(
+                        loop, convert_func, _check_cancellation
                     )
-                    documents.append(doc)
-                    logger.info(f"Successfully converted: {file_path}")
-                    
-                elif path_obj.suffix.lower() in ['.txt', '.md']:
-                    # Handle plain text files directly
-                    logger.info(f"Reading text file directly: {file_path}")
+                except concurrent.futures.TimeoutError:
+                    raise RuntimeError("Processing cancelled by user")
+                
+                # Final check for cancellation after Docling conversion
+                if _check_cancellation():
+                    logger.info("Document processing cancelled after Docling conversion")
+                    raise RuntimeError("Processing cancelled by user")
+                
+                # Extract both markdown and plain text
+                markdown_content = result.document.export_to_markdown()
+                plain_text = result.document.export_to_text()
+                
+                # Smart format selection: use markdown if tables detected, otherwise plain text
+                has_tables = "|" in markdown_content and "---" in markdown_content  # Simple table detection
+                
+                if has_tables:
+                    content_to_use = markdown_content
+                    format_used = "markdown (tables detected)"
+                else:
+                    content_to_use = plain_text
+                    format_used = "plain text (better for entities)"
+                
+                logger.info(f"Using {format_used} for {file_path}")
+                
+                # Log content length for debugging
+                logger.info(f"Docling extracted {len(content_to_use)} characters from {file_path}")
+                logger.debug(f"First 200 chars: {content_to_use[:200]}...")
+                
+                # Create LlamaIndex Document
+                doc = Document(
+                    text=content_to_use,
+                    metadata={
+                        "source": str(file_path),
+                        "conversion_method": "docling",
+                        "file_type": path_obj.suffix,
+                        "file_name": path_obj.name
+                    }
+                )
+                logger.info(f"Successfully converted: {file_path}")
+                return doc
+                
+            elif path_obj.suffix.lower() in ['.txt', '.md']:
+                # Handle plain text files directly
+                logger.info(f"Reading text file directly: {file_path}")
+                if stream is not None:
+                    content = stream.read().decode('utf-8')
+                else:
                     with open(file_path, 'r', encoding='utf-8') as f:
                         content = f.read()
-                    
-                    # Log content length for debugging
-                    logger.info(f"Direct read extracted {len(content)} characters from {file_path}")
-                    logger.debug(f"First 200 chars: {content[:200]}...")
-                    
-                    doc = Document(
-                        text=content,
-                        metadata={
-                            "source": str(file_path),
-                            "conversion_method": "direct",
-                            "file_type": path_obj.suffix,
-                            "file_name": path_obj.name
-                        }
-                    )
-                    documents.append(doc)
-                    logger.info(f"Successfully read text file: {file_path}")
                 
-                else:
-                    logger.warning(f"Unsupported file type: {file_path}")
-                    continue
+                # Log content length for debugging
+                logger.info(f"Direct read extracted {len(content)} characters from {file_path}")
+                logger.debug(f"First 200 chars: {content[:200]}...")
                 
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                continue
-        
-        logger.info(f"Successfully processed {len(documents)} documents")
-        return documents
+                doc = Document(
+                    text=content,
+                    metadata={
+                        "source": str(file_path),
+                        "conversion_method": "direct",
+                        "file_type": path_obj.suffix,
+                        "file_name": path_obj.name
+                    }
+                )
+                logger.info(f"Successfully read text file: {file_path}")
+                return doc
+            
+            else:
+                logger.warning(f"Unsupported file type: {file_path}")
+                return None
+            
+        except Exception as e:
+            # Real user cancellation aborts the batch; other failures (incl. timeouts) skip the file
+            if _check_cancellation():
+                raise
+            logger.error(f"Error processing {file_path}: {e}")
+            return None
     
     def process_text_content(self, content: str, source_name: str = "text_input") -> Document:
         """Create a LlamaIndex Document from text content"""
@@ -1,4 +1,6 @@
 from typing import Dict, Any
+from functools import lru_cache
+import json
 import logging
 
 from llama_index.llms.openai import OpenAI
@@ -141,12 +143,14 @@ class LLMFactory:
                     model=config.get("embedding_model", "text-embedding-3-small"),
                     azure_endpoint=config["azure_endpoint"],
                     api_key=config["api_key"],
-                    api_version=config.get("api_version", "2024-02-01")
+                    api_version=config.get("api_version", "2024-02-01"),
+                    embed_batch_size=config.get("embed_batch_size", 100)
                 )
             else:
                 return OpenAIEmbedding(
                     model_name=config.get("embedding_model", "text-embedding-3-small"),
-                    api_key=config.get("api_key")
+                    api_key=config.get("api_key"),
+                    embed_batch_size=config.get("embed_batch_size", 100)
                 )
         
         elif provider == LLMProvider.OLLAMA:
@@ -155,7 +159,8 @@ class LLMFactory:
             logger.info(f"Configuring Ollama Embeddings - Model: {embedding_model}, Base URL: {base_url}")
             return OllamaEmbedding(
                 model_name=embedding_model,
-                base_url=base_url
+                base_url=base_url,
+                embed_batch_size=config.get("embed_batch_size", 10)
             )
         
         else:
@@ -163,6 +168,16 @@ class LLMFactory:
             logger.warning(f"No embedding model implementation for {provider}, using OpenAI default")
             return OpenAIEmbedding(model_name="text-embedding-3-small")
 
+    @staticmethod
+    def get_shared_embedding_model(provider: LLMProvider, config: Dict[str, Any]):
+        """Get an embedding model shared by every system built with the same provider config"""
+        return _shared_embedding_model(LLMProvider(provider).value, json.dumps(config, sort_keys=True, default=str))
+
+@lru_cache(maxsize=4)
+def _shared_embedding_model(provider: str, config_json: str):
+    """Build one embedding model (and its HTTP client) per provider/config combination"""
+    return LLMFactory.create_embedding_model(LLMProvider(provider), json.loads(config_json))
+
 class DatabaseFactory:
     """Factory for creating database connections"""
     
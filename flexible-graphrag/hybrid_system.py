@@ -1,4 +1,4 @@
-from llama_index.core import VectorStoreIndex, PropertyGraphIndex, StorageContext, Settings, QueryBundle
+from llama_index.core import VectorStoreIndex, PropertyGraphIndex, StorageContext, Settings, QueryBundle, Document
 from llama_index.core.retrievers import QueryFusionRetriever
 from llama_index.retrievers.bm25 import BM25Retriever
 from llama_index.core.ingestion import IngestionPipeline
@@ -9,14 +9,28 @@ from typing import List, Dict, Any, Union
 from pathlib import Path
 import logging
 import asyncio
+from cachetools import TTLCache
 
 from config import Settings as AppSettings, SAMPLE_SCHEMA, SearchDBType, VectorDBType, LLMProvider
 from document_processor import DocumentProcessor
 from factories import LLMFactory, DatabaseFactory
 from sources import FileSystemSource, CmisSource, AlfrescoSource
+from cmis_util import CMISHandler
 
 logger = logging.getLogger(__name__)
 
+# How long a connected CMIS/Alfresco source is reused before reconnecting (seconds)
+REPOSITORY_SOURCE_TTL = 900
+
+def answer_text(response) -> str:
+    """Answer string of a LlamaIndex response (skips __str__ when the text is already set)"""
+    return getattr(response, "response", None) or str(response)
+
+def _jaccard(a: set, b: set) -> float:
+    """Word-set overlap ratio used for result deduplication"""
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
 class SchemaManager:
     """Manages schema definitions for entity and relationship extraction"""
     
@@ -62,7 +76,7 @@ class SchemaManager:
 class HybridSearchSystem:
     """Configurable hybrid search system with full-text, vector, and graph search"""
     
-    def __init__(self, config: AppSettings):
+    def __init__(self, config: AppSettings, embed_model=None):
         self.config = config
         self.document_processor = DocumentProcessor(config)
         self.schema_manager = SchemaManager(config.get_active_schema())
@@ -70,7 +84,7 @@ class HybridSearchSystem:
         # Initialize LLM and embedding models
         logger.info(f"Initializing LLM Provider: {config.llm_provider}")
         self.llm = LLMFactory.create_llm(config.llm_provider, config.llm_config)
-        self.embed_model = LLMFactory.create_embedding_model(config.llm_provider, config.llm_config)
+        self.embed_model = embed_model or LLMFactory.get_shared_embedding_model(config.llm_provider, config.llm_config)
         
         # Log LLM configuration details
         if hasattr(self.llm, 'model'):
@@ -93,8 +107,28 @@ class HybridSearchSystem:
         self.graph_index = None
         self.hybrid_retriever = None
         
+        # Connected CMIS/Alfresco sources, reused by later ingests with the same settings
+        self._sources = TTLCache(maxsize=8, ttl=REPOSITORY_SOURCE_TTL)
+        
         logger.info("HybridSearchSystem initialized successfully with Ollama!" if config.llm_provider == LLMProvider.OLLAMA else "HybridSearchSystem initialized successfully")
     
+    def _get_source(self, source_class, **connection):
+        """Return a connected repository source, reusing one made with the same settings"""
+        key = (source_class.__name__, tuple(sorted(connection.items())))
+        source = self._sources.get(key)
+        if source is None:
+            source = source_class(**connection)
+            self._sources[key] = source
+        else:
+            logger.info(f"Reusing connected {source_class.__name__}")
+        return source
+    
+    def _discard_source(self, source):
+        """Drop a cached source whose connection failed so the next ingest reconnects"""
+        for key, cached in list(self._sources.items()):
+            if cached is source:
+                self._sources.pop(key, None)
+    
     def _setup_databases(self):
         """Initialize database connections based on configuration"""
         
@@ -160,19 +194,23 @@ class HybridSearchSystem:
         logger.info("Database connections established")
     
     @classmethod
-    def from_settings(cls, settings: AppSettings):
-        """Create HybridSearchSystem from Settings object"""
-        return cls(settings)
+    def from_settings(cls, settings: AppSettings, embed_model=None):
+        """Create HybridSearchSystem from Settings object (optionally with a pre-built embedder)"""
+        return cls(settings, embed_model=embed_model)
     
-    async def ingest_documents(self, file_paths: List[Union[str, Path]], processing_id: str = None, status_callback=None):
-        """Process and ingest documents into all search modalities"""
+    async def ingest_documents(self, file_paths: List[Union[str, Path]], processing_id: str = None, status_callback=None,
+                               file_callback=None):
+        """Process and ingest documents into all search modalities
+        
+        file_callback is passed to DocumentProcessor.process_documents for per-file conversion results.
+        """
         
         # Helper function to check cancellation
         def _check_cancellation():
             if processing_id:
                 from backend import PROCESSING_STATUS
-                return (processing_id in PROCESSING_STATUS and 
-                        PROCESSING_STATUS[processing_id]["status"] == "cancelled")
+                record = PROCESSING_STATUS.get(processing_id)
+                return record is not None and record["status"] == "cancelled"
             return False
         
         # Helper function to update progress with file info
@@ -189,21 +227,12 @@ class HybridSearchSystem:
                     total_files=len(file_paths)
                 )
         
-        # Check for partial state and clear it before starting new ingestion
-        if (self.vector_index is None) != (self.graph_index is None):
-            logger.warning("Detected partial system state - clearing before new ingestion")
-            self._clear_partial_state()
-        
-        # Also clear if we have partial retriever setup
-        if self.hybrid_retriever is None and (self.vector_index is not None or self.graph_index is not None):
-            logger.warning("Detected incomplete retriever setup - clearing before new ingestion")
-            self._clear_partial_state()
-        
         # Step 1: Convert documents using Docling
         logger.info("Converting documents with Docling...")
         _update_progress("Converting documents with Docling...", 20, current_phase="docling")
         
-        documents = await self.document_processor.process_documents(file_paths, processing_id=processing_id)
+        documents = await self.document_processor.process_documents(file_paths, processing_id=processing_id,
+                                                                    file_callback=file_callback)
         
         if not documents:
             raise ValueError("No documents were successfully processed")
@@ -213,6 +242,45 @@ class HybridSearchSystem:
             logger.info("Processing cancelled during document conversion")
             raise RuntimeError("Processing cancelled by user")
         
+        await self._index_documents(documents, processing_id=processing_id, status_callback=status_callback,
+                                    total_files=len(file_paths))
+    
+    async def _index_documents(self, documents: List[Document], processing_id: str = None, status_callback=None,
+                               total_files: int = 0):
+        """Index converted documents into all search modalities (steps 2-5 of ingest_documents)"""
+        
+        # Helper function to check cancellation
+        def _check_cancellation():
+            if processing_id:
+                from backend import PROCESSING_STATUS
+                record = PROCESSING_STATUS.get(processing_id)
+                return record is not None and record["status"] == "cancelled"
+            return False
+        
+        # Helper function to update progress with file info
+        def _update_progress(message: str, progress: int, current_file: str = None, current_phase: str = None, files_completed: int = 0):
+            if status_callback:
+                status_callback(
+                    processing_id=processing_id,
+                    status="processing",
+                    message=message,
+                    progress=progress,
+                    current_file=current_file,
+                    current_phase=current_phase,
+                    files_completed=files_completed,
+                    total_files=total_files
+                )
+        
+        # Check for partial state and clear it before starting new ingestion
+        if (self.vector_index is None) != (self.graph_index is None):
+            logger.warning("Detected partial system state - clearing before new ingestion")
+            self._clear_partial_state()
+        
+        # Also clear if we have partial retriever setup
+        if self.hybrid_retriever is None and (self.vector_index is not None or self.graph_index is not None):
+            logger.warning("Detected incomplete retriever setup - clearing before new ingestion")
+            self._clear_partial_state()
+        
         # Step 2: Process documents into nodes once
         logger.info("Processing documents into nodes...")
         _update_progress("Splitting documents into chunks...", 30, current_phase="chunking")
@@ -420,8 +488,9 @@ class HybridSearchSystem:
             self.graph_index = None
             logger.info("Graph index creation skipped - knowledge graph disabled")
         
-        # Step 4: Setup hybrid retriever
-        self._setup_hybrid_retriever()
+        # Step 4: Setup hybrid retriever (may index into Elasticsearch/OpenSearch, whose
+        # clients run their own event loop - keep that off this one)
+        await loop.run_in_executor(None, self._setup_hybrid_retriever)
         
         # Step 5: Persist indexes if configured
         self._persist_indexes()
@@ -458,8 +527,9 @@ class HybridSearchSystem:
                 "folder_path": os.getenv("CMIS_FOLDER_PATH", "/")
             }
         
-        # Initialize CMIS source
-        cmis_source = CmisSource(
+        # Initialize CMIS source (or reuse the connected one)
+        cmis_source = self._get_source(
+            CmisSource,
             url=config["url"],
             username=config["username"],
             password=config["password"],
@@ -476,7 +546,11 @@ class HybridSearchSystem:
             )
         
         # Get documents from CMIS
-        cmis_docs = cmis_source.list_files()
+        try:
+            cmis_docs = cmis_source.list_files()
+        except Exception:
+            self._discard_source(cmis_source)
+            raise
         
         if not cmis_docs:
             logger.warning("No supported documents found in CMIS repository")
@@ -500,80 +574,72 @@ class HybridSearchSystem:
                 files_completed=0
             )
         
-        # Create temporary directory for downloaded files
-        import tempfile
-        import os
-        
-        temp_dir = tempfile.mkdtemp(prefix="cmis_ingestion_")
-        temp_files = []
+        # Download with CMISHandler and convert each document as it arrives, so downloads
+        # overlap Docling conversion; everything converted is then indexed in one go
+        # Unchanged documents are only skipped if extracted with the same schema and LLM
+        llm_model = self.config.llm_config.get("model", "")
+        handler = CMISHandler(
+            config["url"], config["username"], config["password"],
+            dedup_path=self.config.cmis_dedup_path,
+            repo=cmis_source.repo,
+            dedup_scope=f"{self.config.schema_name}|{self.config.llm_provider}|{llm_model}"
+        )
+        converted: Dict[str, Document] = {}
         
-        try:
-            # Download all documents to temporary files
-            for i, doc in enumerate(cmis_docs):
-                try:
-                    # Update progress during download
-                    if status_callback:
-                        download_progress = 50 + int((i / len(cmis_docs)) * 20)  # 50-70% for downloads
-                        status_callback(
-                            processing_id=processing_id,
-                            status="processing",
-                            message=f"Downloading document {i+1}/{len(cmis_docs)}: {doc['name']}",
-                            progress=download_progress,
-                            current_file=doc['name'],
-                            current_phase="downloading",
-                            files_completed=i,
-                            total_files=len(cmis_docs)
-                        )
-                    
-                    temp_file_path = cmis_source.download_document(doc, temp_dir)
-                    temp_files.append(temp_file_path)
-                    logger.info(f"Downloaded CMIS document: {doc['name']} -> {temp_file_path}")
-                except Exception as e:
-                    logger.error(f"Failed to download CMIS document {doc['name']}: {str(e)}")
-                    continue
-            
-            if temp_files:
-                # Update status: Starting document processing
-                if status_callback:
-                    status_callback(
-                        processing_id=processing_id,
-                        status="processing",
-                        message=f"Processing {len(temp_files)} downloaded document(s)...",
-                        progress=70,
-                        total_files=len(temp_files),
-                        files_completed=0
-                    )
-                
-                # Process the downloaded files
-                await self.ingest_documents(temp_files, processing_id=processing_id, status_callback=status_callback)
-                logger.info(f"Successfully ingested {len(temp_files)} documents from CMIS")
+        async def _convert(doc_id: str, doc_name: str, content) -> None:
+            if isinstance(content, str):
+                document = await self.document_processor.process_document(content, processing_id=processing_id)
             else:
-                logger.warning("No documents were successfully downloaded from CMIS")
-                if status_callback:
-                    status_callback(
-                        processing_id=processing_id,
-                        status="completed",
-                        message="No documents were successfully downloaded from CMIS",
-                        progress=100
-                    )
-                
-        finally:
-            # Clean up temporary files
-            for temp_file in temp_files:
-                try:
-                    if os.path.exists(temp_file):
-                        os.unlink(temp_file)
-                        logger.debug(f"Cleaned up temporary file: {temp_file}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up temporary file {temp_file}: {str(e)}")
-            
-            # Remove temporary directory
-            try:
-                if os.path.exists(temp_dir):
-                    os.rmdir(temp_dir)
-                    logger.debug(f"Cleaned up temporary directory: {temp_dir}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temporary directory {temp_dir}: {str(e)}")
+                # Small documents arrive in memory - Docling reads them without a temp file
+                document = await self.document_processor.process_document(doc_name, processing_id=processing_id,
+                                                                           stream=content)
+            if document is None:
+                raise ValueError(f"Document could not be converted: {doc_name}")
+            document.metadata["source"] = doc_name
+            document.metadata["file_name"] = doc_name
+            converted[doc_id] = document
+            if status_callback:
+                status_callback(
+                    processing_id=processing_id,
+                    status="processing",
+                    message=f"Converted document {len(converted)}/{len(cmis_docs)}: {doc_name}",
+                    progress=50 + int((len(converted) / len(cmis_docs)) * 20),  # 50-70% for downloads
+                    current_file=doc_name,
+                    current_phase="docling",
+                    files_completed=len(converted),
+                    total_files=len(cmis_docs)
+                )
+        
+        await handler.process_documents(
+            [doc['cmis_object'] for doc in cmis_docs],
+            _convert,
+            concurrency=self.config.cmis_concurrency,
+            in_memory_limit=self.config.cmis_memory_download_limit
+        )
+        
+        # Conversion failures are skipped per document - a cancelled run must still stop here
+        if processing_id:
+            from backend import PROCESSING_STATUS
+            record = PROCESSING_STATUS.get(processing_id)
+            if record is not None and record["status"] == "cancelled":
+                logger.info("Processing cancelled during CMIS download")
+                raise RuntimeError("Processing cancelled by user")
+        
+        # Keep the repository listing order regardless of which conversion finished first
+        documents = [converted[doc['id']] for doc in cmis_docs if doc['id'] in converted]
+        if documents:
+            await self._index_documents(documents, processing_id=processing_id, status_callback=status_callback,
+                                        total_files=len(documents))
+            logger.info(f"Successfully ingested {len(documents)} documents from CMIS")
+        else:
+            logger.warning("No documents were successfully downloaded from CMIS")
+            if status_callback:
+                status_callback(
+                    processing_id=processing_id,
+                    status="completed",
+                    message="No documents were successfully downloaded from CMIS",
+                    progress=100
+                )
     
     async def ingest_alfresco(self, alfresco_config: dict = None, processing_id: str = None, status_callback=None):
         """Ingest documents from Alfresco source"""
@@ -591,8 +657,9 @@ class HybridSearchSystem:
                 "path": os.getenv("ALFRESCO_PATH", "/")
             }
         
-        # Initialize Alfresco source
-        alfresco_source = AlfrescoSource(
+        # Initialize Alfresco source (or reuse the connected one)
+        alfresco_source = self._get_source(
+            AlfrescoSource,
             base_url=config["url"],
             username=config["username"],
             password=config["password"],
@@ -609,7 +676,11 @@ class HybridSearchSystem:
             )
         
         # Get documents from Alfresco
-        alfresco_docs = alfresco_source.list_files()
+        try:
+            alfresco_docs = alfresco_source.list_files()
+        except Exception:
+            self._discard_source(alfresco_source)
+            raise
         
         if not alfresco_docs:
             logger.warning("No supported documents found in Alfresco repository")
@@ -708,7 +779,8 @@ class HybridSearchSystem:
             except Exception as e:
                 logger.warning(f"Failed to clean up temporary directory {temp_dir}: {str(e)}")
     
-    async def ingest_text(self, content: str, source_name: str = "text_input", processing_id: str = None):
+    async def ingest_text(self, content: str, source_name: str = "text_input", processing_id: str = None,
+                          status_callback=None):
         """Ingest raw text content"""
         logger.info(f"Ingesting text content from: {source_name}")
         
@@ -716,10 +788,20 @@ class HybridSearchSystem:
         def _check_cancellation():
             if processing_id:
                 from backend import PROCESSING_STATUS
-                return (processing_id in PROCESSING_STATUS and 
-                        PROCESSING_STATUS[processing_id]["status"] == "cancelled")
+                record = PROCESSING_STATUS.get(processing_id)
+                return record is not None and record["status"] == "cancelled"
             return False
         
+        # Helper function to report the pipeline stage as it is reached
+        def _update_progress(message: str, progress: int):
+            if status_callback:
+                status_callback(
+                    processing_id=processing_id,
+                    status="processing",
+                    message=message,
+                    progress=progress
+                )
+        
         # Create document from text
         document = self.document_processor.process_text_content(content, source_name)
         
@@ -735,6 +817,7 @@ class HybridSearchSystem:
             raise RuntimeError("Processing cancelled by user")
         
         # Process similar to file ingestion but with single document
+        _update_progress("Processing text and generating embeddings...", 30)
         pipeline = IngestionPipeline(
             transformations=[
                 SentenceSplitter(
@@ -770,6 +853,7 @@ class HybridSearchSystem:
             raise RuntimeError("Processing cancelled by user")
         
         # Update or create indexes
+        _update_progress("Building vector index...", 50)
         if self.vector_index is None:
             storage_context = StorageContext.from_defaults(vector_store=self.vector_store)
             
@@ -791,8 +875,8 @@ class HybridSearchSystem:
             )
             self.vector_index = await loop.run_in_executor(None, create_vector_index)
         else:
-            # Add to existing index
-            self.vector_index.insert_nodes(nodes)
+            # Add to existing index (store clients may drive their own event loop)
+            await loop.run_in_executor(None, self.vector_index.insert_nodes, nodes)
         
         # Check for cancellation after vector index creation/update
         if _check_cancellation():
@@ -800,6 +884,7 @@ class HybridSearchSystem:
             raise RuntimeError("Processing cancelled by user")
         
         # Update graph index - always use knowledge graph extraction for graph functionality
+        _update_progress("Extracting knowledge graph...", 70)
         kg_extractors = []
         if self.config.schema_config is not None:
             kg_extractor = self.schema_manager.create_extractor(
@@ -842,16 +927,16 @@ class HybridSearchSystem:
             )
             self.graph_index = await loop.run_in_executor(None, create_graph_index)
         else:
-            # Add to existing graph index
-            self.graph_index.insert_nodes(nodes)
+            # Add to existing graph index (runs KG extraction - keep it off the event loop)
+            await loop.run_in_executor(None, self.graph_index.insert_nodes, nodes)
         
         # Check for cancellation after graph index creation/update
         if _check_cancellation():
             logger.info("Processing cancelled during text graph index creation")
             raise RuntimeError("Processing cancelled by user")
         
-        # Setup hybrid retriever
-        self._setup_hybrid_retriever()
+        # Setup hybrid retriever (may index into Elasticsearch/OpenSearch off the event loop)
+        await loop.run_in_executor(None, self._setup_hybrid_retriever)
         
         logger.info("Text content ingestion completed successfully!")
     
@@ -1124,6 +1209,25 @@ class HybridSearchSystem:
     async def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
         """Execute hybrid search across all modalities"""
         
+        results = await self._retrieve(query, top_k)
+        logger.info(f"Returning {len(results)} deduplicated results")
+        return self._format_results(results)
+    
+    async def search_and_answer(self, query: str, top_k: int = 10) -> Dict[str, Any]:
+        """Run one hybrid retrieval and use its results for both the hit list and the answer"""
+        
+        results = await self._retrieve(query, top_k)
+        query_engine = self.get_query_engine()
+        
+        # Synthesize from the already retrieved nodes instead of letting the engine retrieve again
+        response = await query_engine.asynthesize(QueryBundle(query_str=query), results)
+        
+        logger.info(f"Answered query from {len(results)} deduplicated results")
+        return {"answer": answer_text(response), "results": self._format_results(results)}
+    
+    async def _retrieve(self, query: str, top_k: int) -> list:
+        """Retrieve, filter and deduplicate hybrid search results as scored nodes"""
+        
         # Check for complete system initialization
         if not self.hybrid_retriever:
             raise ValueError("System not initialized. Please ingest documents first.")
@@ -1143,8 +1247,9 @@ class HybridSearchSystem:
         logger.info(f"Raw results: {len(raw_results)}, Filtered results (score > {min_score_threshold}): {len(filtered_results)}")
         
         # Log scores for debugging
-        for i, result in enumerate(raw_results):
-            logger.info(f"Result {i}: score={result.score:.3f}, text_preview={result.text[:50]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, result in enumerate(raw_results):
+                logger.debug(f"Result {i}: score={result.score:.3f}, text_preview={result.text[:50]}...")
             
         # Use filtered results for final processing
         results = filtered_results[:top_k]
@@ -1175,8 +1280,10 @@ class HybridSearchSystem:
         logger.info(f"Retrieved {len(results)} results from hybrid search")
         
         # Enhanced deduplication with multiple strategies
+        # Word sets are computed once per kept result instead of once per comparison
         seen_content = set()
-        seen_sources = {}  # source -> content mapping for additional dedup
+        seen_sources = {}  # source -> [(content_hash, hash_words)] for additional dedup
+        plain_cores = []  # core word sets of kept results without entity-relationship format
         deduplicated_results = []
         
         for result in results:
@@ -1188,51 +1295,44 @@ class HybridSearchSystem:
             
             # Strategy 2: Create content hash from core content
             content_hash = core_content[:300].strip().lower()
+            hash_words = set(content_hash.split())
             
             # Strategy 3: Check for exact source + core content combination
             content_key = f"{source}::{content_hash}"
             
             # Strategy 4: Check for very similar content from same source
             similar_found = False
-            if source in seen_sources:
-                for existing_content in seen_sources[source]:
+            if source in seen_sources and len(content_hash) > 50:
+                for existing_content, existing_words in seen_sources[source]:
                     # Check if content is very similar (overlap > 70%)
-                    if len(content_hash) > 50 and len(existing_content) > 50:
-                        overlap = len(set(content_hash.split()) & set(existing_content.split()))
-                        total_words = len(set(content_hash.split()) | set(existing_content.split()))
-                        if total_words > 0 and overlap / total_words > 0.7:
-                            similar_found = True
-                            break
+                    if len(existing_content) > 50 and _jaccard(hash_words, existing_words) > 0.7:
+                        similar_found = True
+                        break
             
             # Strategy 5: Check for entity-relationship patterns that might be duplicates
             if not similar_found and "->" in full_text:
                 # This might be a graph result with entity-relationship format
-                # Check if we already have the original text version
-                for existing_result in deduplicated_results:
-                    existing_text = existing_result.text.strip()
-                    existing_core = self._extract_core_content(existing_text)
-                    
-                    # If existing result doesn't have entity-relationship format but has similar core content
-                    if "->" not in existing_text and len(existing_core) > 50:
-                        overlap = len(set(core_content.split()) & set(existing_core.split()))
-                        total_words = len(set(core_content.split()) | set(existing_core.split()))
-                        if total_words > 0 and overlap / total_words > 0.6:
-                            similar_found = True
-                            break
+                # Check if we already have the original text version with similar core content
+                core_words = set(core_content.split())
+                similar_found = any(_jaccard(core_words, existing_words) > 0.6 for existing_words in plain_cores)
             
             if content_key not in seen_content and not similar_found:
                 seen_content.add(content_key)
-                if source not in seen_sources:
-                    seen_sources[source] = []
-                seen_sources[source].append(content_hash)
+                seen_sources.setdefault(source, []).append((content_hash, hash_words))
+                if "->" not in full_text and len(core_content) > 50:
+                    plain_cores.append(set(core_content.split()))
                 deduplicated_results.append(result)
                 logger.debug(f"Added result from {source}: {core_content[:100]}...")
             else:
                 logger.debug(f"Deduplicated result from {source}: {core_content[:100]}...")
         
-        # Format and rank results
+        return deduplicated_results[:top_k]
+    
+    def _format_results(self, results: list) -> List[Dict[str, Any]]:
+        """Format and rank scored nodes for API responses"""
+        
         formatted_results = []
-        for i, result in enumerate(deduplicated_results[:top_k]):
+        for i, result in enumerate(results):
             formatted_results.append({
                 "rank": i + 1,
                 "content": result.text,
@@ -1242,7 +1342,6 @@ class HybridSearchSystem:
                 "file_name": result.metadata.get("file_name", "Unknown")
             })
         
-        logger.info(f"Returning {len(formatted_results)} deduplicated results")
         return formatted_results
     
     def _extract_core_content(self, text: str) -> str:
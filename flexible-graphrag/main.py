@@ -2,40 +2,28 @@ import os
 import logging
 import sys
 from datetime import datetime
-from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import List, Optional, Dict
-import asyncio
 from pathlib import Path
 import uvicorn
 import shutil
 from dotenv import load_dotenv
 import importlib.metadata
-import nest_asyncio
-from config import Settings, DataSourceType
-from backend import get_backend
 
-# Load environment variables
+# Load environment variables (before config/backend read settings at import)
 load_dotenv()
 
-# Fix for async event loop issues with containers and LlamaIndex
-if sys.platform == 'win32':
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-else:
-    # Docker/Linux environments - use default policy but ensure proper loop handling
-    asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
+from config import DataSourceType, get_settings
+from backend import get_backend, enable_nested_loops, configure_event_loop
 
-# Apply nest_asyncio to allow nested event loops (required for LlamaIndex in FastAPI)
-nest_asyncio.apply()
-
-# Ensure we have a proper event loop for Docker containers
-try:
-    loop = asyncio.get_running_loop()
-except RuntimeError:
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+# The server's event loop (uvloop or stdlib) is picked by configure_event_loop() at startup
+if get_settings().allow_nested_loops:
+    # Allow nested event loops (opt-in, stdlib loop only)
+    enable_nested_loops()
 
 # Configure logging with both file and console output
 log_filename = f'flexible-graphrag-api-{datetime.now().strftime("%Y%m%d-%H%M%S")}.log'
@@ -66,7 +54,8 @@ console_handler.flush()
 app = FastAPI(
     title="Flexible GraphRAG API",
     description="API for processing documents with configurable hybrid search (vector, graph, full-text)",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # Faster serialization of large search/query payloads
 )
 
 # CORS middleware
@@ -112,7 +101,7 @@ class Document(BaseModel):
     content: str
 
 # Initialize system
-settings = Settings()
+settings = get_settings()
 backend_instance = get_backend()
 
 # Lifecycle events for proper resource cleanup
@@ -120,6 +109,7 @@ backend_instance = get_backend()
 async def shutdown_event():
     """Clean up resources when the application shuts down."""
     logger.info("Application shutdown: cleaning up resources")
+    await backend_instance.shutdown()
 
 # API Endpoints
 @app.get("/api/health")
@@ -288,6 +278,46 @@ async def query_graph(request: QueryRequest):
         logger.error(f"Error querying system: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse_event(data: str, event: str = None) -> str:
+    """Format one server-sent event (multi-line data becomes several data: lines)"""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+@app.post("/api/query/stream")
+async def query_graph_stream(request: QueryRequest):
+    """Stream the AI-generated answer as server-sent events while it is generated."""
+    logger.info(f"Processing streaming query: {request.query}")
+    
+    async def events():
+        try:
+            async for token in backend_instance.stream_query(request.query, request.top_k):
+                yield _sse_event(token)
+            yield _sse_event("", event="done")
+        except Exception as e:
+            logger.error(f"Error streaming query: {str(e)}")
+            yield _sse_event(str(e), event="error")
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.post("/api/search-and-answer")
+async def search_and_answer(request: QueryRequest):
+    """Return hybrid search results and an AI-generated answer from one retrieval."""
+    try:
+        logger.info(f"Processing search and answer: {request.query}")
+        result = await backend_instance.search_and_answer(request.query, request.top_k)
+        
+        if result["success"]:
+            logger.info("Search and answer completed successfully")
+            return {"success": True, "answer": result["answer"], "results": result["results"]}
+        else:
+            raise HTTPException(500, result["error"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during search and answer: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/status")
 async def get_status():
     try:
@@ -335,15 +365,34 @@ async def ingest_custom_text(request: TextIngestRequest):
         logger.error(f"Error starting text ingestion: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/ingest-text/stream")
+async def ingest_streamed_text(request: Request, source_name: str = "text-stream"):
+    """Start async ingestion of a raw UTF-8 text body, read as it arrives."""
+    try:
+        logger.info(f"Starting async streamed text ingestion: source='{source_name}'")
+        result = await backend_instance.ingest_text_stream(request.stream(), source_name=source_name)
+        
+        logger.info(f"Text ingestion started with ID: {result['processing_id']}")
+        return result
+    except Exception as e:
+        logger.error(f"Error starting streamed text ingestion: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/processing-status/{processing_id}")
-async def get_processing_status(processing_id: str):
-    """Get processing status by ID."""
+async def get_processing_status(processing_id: str, request: Request, response: Response):
+    """Get processing status by ID (supports If-None-Match for cheap polling)."""
     try:
         logger.info(f"Checking processing status for ID: {processing_id}")
+        etag = backend_instance.get_processing_etag(processing_id)
+        if etag is not None and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
         result = backend_instance.get_processing_status(processing_id)
         
         if result["success"]:
             logger.info(f"Status retrieved for {processing_id}: {result['processing']['status']}")
+            if etag is not None:
+                response.headers["ETag"] = etag
             return result["processing"]
         else:
             raise HTTPException(404, result["error"])
@@ -353,6 +402,30 @@ async def get_processing_status(processing_id: str):
         logger.error(f"Error getting processing status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.websocket("/api/ws/processing-status/{processing_id}")
+async def processing_status_updates(websocket: WebSocket, processing_id: str):
+    """Push processing status updates until the job finishes (alternative to polling)."""
+    await websocket.accept()
+    queue = backend_instance.subscribe_processing(processing_id)
+    try:
+        result = backend_instance.get_processing_status(processing_id)
+        if not result["success"]:
+            await websocket.send_json({"error": result["error"]})
+            return
+        
+        processing = result["processing"]
+        while True:
+            await websocket.send_json(processing)
+            if processing["status"] in ("completed", "failed", "cancelled"):
+                break
+            processing = await queue.get()
+    except WebSocketDisconnect:
+        logger.info(f"Status subscriber for {processing_id} disconnected")
+    finally:
+        backend_instance.unsubscribe_processing(processing_id, queue)
+        if websocket.client_state.name == "CONNECTED":
+            await websocket.close()
+
 @app.post("/api/cancel-processing/{processing_id}")
 async def cancel_processing(processing_id: str):
     """Cancel processing by ID."""
@@ -371,6 +444,17 @@ async def cancel_processing(processing_id: str):
         logger.error(f"Error cancelling processing: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/clear-cache")
+async def clear_cache():
+    """Invalidate cached search and query results."""
+    try:
+        result = backend_instance.clear_cache()
+        logger.info(f"Result cache cleared ({result['cleared']} entries)")
+        return result
+    except Exception as e:
+        logger.error(f"Error clearing result cache: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/cleanup-uploads")
 async def cleanup_uploads_endpoint(keep_recent: int = 0):
     """Clean up uploaded files, optionally keeping most recent files"""
@@ -424,8 +508,13 @@ async def get_api_info():
             "ingest": "/api/ingest",
             "search": "/api/search", 
             "query": "/api/query",
+            "query_stream": "/api/query/stream",
+            "ingest_text_stream": "/api/ingest-text/stream",
+            "search_and_answer": "/api/search-and-answer",
             "status": "/api/status",
+            "processing_status_ws": "/api/ws/processing-status/{processing_id}",
             "test_sample": "/api/test-sample",
+            "clear_cache": "/api/clear-cache",
             "python_info": "/api/python-info",
             "graph": "/api/graph"
         },
@@ -597,4 +686,4 @@ async def root():
     }
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop=configure_event_loop())
@@ -22,6 +22,26 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Size of the reusable buffer repository downloads are copied through
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+def copy_stream(stream, sink, buffer: bytearray) -> int:
+    """Copy a content stream into sink through a reusable buffer, returning the bytes copied"""
+    view = memoryview(buffer)
+    readinto = getattr(stream, "readinto", None)
+    total = 0
+    while True:
+        if readinto is not None:
+            count = readinto(view)
+            chunk = view[:count] if count else None
+        else:
+            chunk = stream.read(len(buffer))
+            count = len(chunk) if chunk else 0
+        if not count:
+            return total
+        sink.write(chunk)
+        total += count
+
 def is_docling_supported(content_type: str, filename: str) -> bool:
     """Check if document type is supported by Docling"""
     content_type_lower = content_type.lower()
@@ -140,6 +160,8 @@ class CmisSource:
         try:
             self.client = CmisClient(url, username, password)
             self.repo = self.client.getDefaultRepository()
+            # Downloads run one at a time per source, so one buffer is reused for all of them
+            self._download_buffer = bytearray(DOWNLOAD_CHUNK_SIZE)
             logger.info("Successfully connected to CMIS repository")
         except Exception as e:
             logger.error(f"Failed to connect to CMIS repository: {str(e)}")
@@ -276,8 +298,7 @@ class CmisSource:
             # Download content
             content_stream = cmis_object.getContentStream()
             if content_stream:
-                content = content_stream.read()
-                temp_file.write(content)
+                copy_stream(content_stream, temp_file, self._download_buffer)
                 temp_file.flush()
                 temp_file.close()
                 
@@ -322,6 +343,8 @@ class AlfrescoSource:
             logger.info(f"AlfrescoSource using CMIS URL: {cmis_url}")
             self.cmis_client = CmisClient(cmis_url, username, password)
             self.repo = self.cmis_client.defaultRepository
+            # Downloads run one at a time per source, so one buffer is reused for all of them
+            self._download_buffer = bytearray(DOWNLOAD_CHUNK_SIZE)
             
             logger.info("Successfully connected to Alfresco repository (python-alfresco-api + CMIS for paths)")
         except Exception as e:
@@ -483,7 +506,7 @@ class AlfrescoSource:
                 cmis_object = document['cmis_object']
                 content_stream = cmis_object.getContentStream()
                 if content_stream:
-                    temp_file.write(content_stream.read())
+                    copy_stream(content_stream, temp_file, self._download_buffer)
                     content_stream.close()
                     content_downloaded = True
                     logger.info(f"Downloaded via CMIS: {filename}")
@@ -6,6 +6,12 @@ Usage: uv run start.py
 
 import uvicorn
 import platform
+from dotenv import load_dotenv
+
+# Load environment variables (ALLOW_NESTED_LOOPS decides the event loop)
+load_dotenv()
+
+from backend import configure_event_loop
 
 if __name__ == "__main__":
     # Disable reload on Windows to prevent multiprocessing conflicts
@@ -16,5 +22,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=not is_windows,  # Disable reload on Windows
-        log_level="info"
+        log_level="info",
+        loop=configure_event_loop()
     )
\ No newline at end of file
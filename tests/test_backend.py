@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared FlexibleGraphRAGBackend
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import Mock, AsyncMock
+
+# Add the flexible-graphrag directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "flexible-graphrag"))
+
+from config import Settings
+from backend import FlexibleGraphRAGBackend
+
+def make_backend(**settings_overrides) -> FlexibleGraphRAGBackend:
+    """Create a backend with a mocked HybridSearchSystem"""
+    backend = FlexibleGraphRAGBackend(Settings(**settings_overrides))
+    backend._system = Mock()
+    backend._system.search = AsyncMock(return_value=[{"rank": 1, "content": "Paul Atreides"}])
+    return backend
+
+class TestResultCache:
+    """Test search/query result caching"""
+
+    def test_repeated_search_hits_cache(self):
+        backend = make_backend()
+        first = asyncio.run(backend.search_documents("Who is Paul?", top_k=5))
+        second = asyncio.run(backend.search_documents("  who is paul?  ", top_k=5))
+
+        assert first == second
+        assert backend._system.search.await_count == 1
+
+    def test_bypass_cache_and_top_k_miss(self):
+        backend = make_backend()
+        asyncio.run(backend.search_documents("Who is Paul?", top_k=5))
+        asyncio.run(backend.search_documents("Who is Paul?", top_k=10))
+        asyncio.run(backend.search_documents("Who is Paul?", top_k=5, bypass_cache=True))
+
+        assert backend._system.search.await_count == 3
+
+    def test_failed_search_not_cached(self):
+        backend = make_backend()
+        backend._system.search = AsyncMock(side_effect=ValueError("System not initialized"))
+        asyncio.run(backend.search_documents("Who is Paul?"))
+        asyncio.run(backend.search_documents("Who is Paul?"))
+
+        assert backend._system.search.await_count == 2
+
+    def test_concurrent_identical_searches_share_one_call(self):
+        backend = make_backend(query_cache_size=0)
+
+        async def slow_search(query, top_k=10):
+            await asyncio.sleep(0.01)
+            return [{"rank": 1, "content": "Paul Atreides"}]
+
+        backend._system.search = AsyncMock(side_effect=slow_search)
+
+        async def search_concurrently():
+            return await asyncio.gather(*(backend.search_documents("Who is Paul?") for _ in range(3)))
+
+        results = asyncio.run(search_concurrently())
+
+        assert all(result == results[0] for result in results)
+        assert backend._system.search.await_count == 1
+
+    def test_search_and_answer_primes_search_cache(self):
+        backend = make_backend()
+        backend._system.search_and_answer = AsyncMock(return_value={
+            "answer": "Paul is the Duke's son",
+            "results": [{"rank": 1, "content": "Paul Atreides"}],
+        })
+        combined = asyncio.run(backend.search_and_answer("Who is Paul?", top_k=5))
+        search = asyncio.run(backend.search_documents("Who is Paul?", top_k=5))
+
+        assert combined["answer"] == "Paul is the Duke's son"
+        assert search["results"] == combined["results"]
+        assert backend._system.search.await_count == 0
+
+    def test_stream_query_yields_tokens_and_fills_cache(self):
+        backend = make_backend()
+
+        async def tokens():
+            for token in ["Paul ", "is ", "Muad'Dib"]:
+                yield token
+
+        response = Mock()
+        response.async_response_gen = tokens
+        backend._system.get_query_engine.return_value.aquery = AsyncMock(return_value=response)
+
+        async def collect():
+            return [token async for token in backend.stream_query("Who is Paul?", top_k=5)]
+
+        assert asyncio.run(collect()) == ["Paul ", "is ", "Muad'Dib"]
+        assert asyncio.run(collect()) == ["Paul is Muad'Dib"]
+        assert backend._system.get_query_engine.call_count == 1
+
+    def test_qa_query_reads_response_text(self):
+        backend = make_backend()
+        response = Mock(response="Paul is Muad'Dib")
+        backend._system.get_query_engine.return_value.aquery = AsyncMock(return_value=response)
+
+        result = asyncio.run(backend.qa_query("Who is Paul?"))
+
+        assert result == {"success": True, "answer": "Paul is Muad'Dib"}
+
+    def test_completed_ingestion_clears_cache(self):
+        backend = make_backend()
+        asyncio.run(backend.search_documents("Who is Paul?"))
+        backend._update_processing_status("test-id", "completed", "Done", 100)
+        asyncio.run(backend.search_documents("Who is Paul?"))
+
+        assert backend._system.search.await_count == 2
+
+class TestSemanticQueryCache:
+    """Test embedding-similarity answer caching"""
+
+    def test_similar_embedding_hits(self):
+        from backend import SemanticQueryCache
+        cache = SemanticQueryCache(threshold=0.95, maxsize=10, ttl=300)
+        cache.add([1.0, 0.0, 0.0], {"success": True, "answer": "Caladan"})
+
+        assert cache.lookup([0.99, 0.05, 0.0]) == {"success": True, "answer": "Caladan"}
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+
+    def test_evicts_least_recently_used(self):
+        from backend import SemanticQueryCache
+        cache = SemanticQueryCache(threshold=0.95, maxsize=2, ttl=300)
+        cache.add([1.0, 0.0], {"answer": "a"})
+        cache.add([0.0, 1.0], {"answer": "b"})
+        cache.lookup([1.0, 0.0])
+        cache.add([-1.0, 0.0], {"answer": "c"})
+
+        assert len(cache) == 2
+        assert cache.lookup([0.0, 1.0]) is None
+        assert cache.lookup([1.0, 0.0]) == {"answer": "a"}
+
+class TestStatusEndpoints:
+    """Test the cheap status/config/health responses"""
+
+    def test_config_snapshot(self):
+        backend = make_backend()
+        config = backend.get_config()["config"]
+
+        assert config["vector_db"] == backend.settings.vector_db
+        assert config["search_db"] == backend.settings.search_db
+        assert backend.get_system_status()["status"]["config"] is config
+
+    def test_completion_message_lists_enabled_features(self):
+        backend = make_backend(vector_db="neo4j", graph_db="none", search_db="bm25")
+
+        assert backend._generate_completion_message(3) == "Successfully ingested 3 document(s)! Vector Index And Bm25 Search ready."
+
+    def test_system_status_reused_within_ttl(self):
+        backend = make_backend()
+        first = backend.get_system_status()
+        backend._system = None
+
+        assert backend.get_system_status() is first
+        assert backend.health_check() == {"success": True, "status": "ok"}
+
+    def test_processing_etag_tracks_version(self):
+        backend = make_backend()
+        backend._update_processing_status("etag-id", "processing", "Working", 10)
+        first = backend.get_processing_etag("etag-id")
+        backend._update_processing_status("etag-id", "processing", "Still working", 20)
+
+        assert first == '"etag-id:1"'
+        assert backend.get_processing_etag("etag-id") == '"etag-id:2"'
+        assert backend.get_processing_etag("missing") is None
+
+    def test_identical_status_update_skipped(self):
+        backend = make_backend()
+        backend._update_processing_status("same-id", "processing", "Working", 10)
+        backend._update_processing_status("same-id", "processing", "Working", 10)
+
+        assert backend.get_processing_etag("same-id") == '"same-id:1"'
+
+    def test_status_updates_pushed_to_subscribers(self):
+        from backend import STATUS_PUSH_INTERVAL
+        backend = make_backend()
+
+        async def subscribe_and_update():
+            queue = backend.subscribe_processing("push-id")
+            backend._update_processing_status("push-id", "processing", "Working", 10)
+            backend._update_processing_status("push-id", "processing", "Still working", 20)
+            await asyncio.sleep(0)
+            coalesced = queue.empty()
+            await asyncio.sleep(STATUS_PUSH_INTERVAL * 2)
+            latest = queue.get_nowait()
+            backend.unsubscribe_processing("push-id", queue)
+            return coalesced, queue, latest
+
+        coalesced, queue, latest = asyncio.run(subscribe_and_update())
+
+        assert coalesced
+        assert latest["message"] == "Still working"
+        assert queue.empty()
+        assert "push-id" not in backend._subscribers
+
+    def test_status_updates_from_worker_threads_are_coalesced(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from backend import STATUS_PUSH_INTERVAL
+        backend = make_backend()
+
+        async def subscribe_and_update_from_threads():
+            queue = backend.subscribe_processing("thread-id")
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda progress: backend._update_processing_status(
+                    "thread-id", "processing", "Working", progress), range(1, 200)))
+            backend._update_processing_status("thread-id", "processing", "Last step", 99)
+            await asyncio.sleep(STATUS_PUSH_INTERVAL * 2)
+            return queue.get_nowait()
+
+        latest = asyncio.run(subscribe_and_update_from_threads())
+
+        assert latest["message"] == "Last step"
+        assert not backend._pending_pushes
+
+    def test_terminal_status_pushed_immediately(self):
+        backend = make_backend()
+
+        async def subscribe_and_finish():
+            queue = backend.subscribe_processing("final-id")
+            backend._update_processing_status("final-id", "processing", "Working", 10)
+            backend._update_processing_status("final-id", "completed", "Done", 100)
+            await asyncio.sleep(0)
+            return queue.get_nowait()
+
+        assert asyncio.run(subscribe_and_finish())["status"] == "completed"
+
+    def test_ingest_text_stream_decodes_split_characters(self):
+        backend = make_backend()
+        backend.ingest_text = AsyncMock(return_value={"processing_id": "text-id"})
+        encoded = "Arrakis — Dune".encode("utf-8")
+
+        async def body():
+            yield encoded[:9]  # splits the multi-byte dash
+            yield encoded[9:]
+
+        result = asyncio.run(backend.ingest_text_stream(body(), source_name="dune"))
+
+        assert result == {"processing_id": "text-id"}
+        backend.ingest_text.assert_awaited_once_with("Arrakis — Dune", "dune")
+
+class TestSingletons:
+    """Test process-wide settings and backend reuse"""
+
+    def test_get_settings_and_backend_are_cached(self):
+        from config import get_settings
+        from backend import get_backend
+
+        assert get_settings() is get_settings()
+        assert get_backend() is get_backend()
+        assert get_backend().settings is get_settings()
+
+    def test_system_built_once_under_concurrent_access(self):
+        import threading
+        import time
+        from unittest.mock import patch
+        backend = make_backend()
+        backend._system = None
+        calls = []
+
+        def from_settings(settings):
+            calls.append(settings)
+            time.sleep(0.05)
+            return Mock()
+
+        with patch("hybrid_system.HybridSearchSystem.from_settings", side_effect=from_settings):
+            threads = [threading.Thread(target=lambda: backend.system) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(calls) == 1
+
+class TestProcessingEstimate:
+    """Test directory sizing for processing time estimates"""
+
+    def test_scan_tree_walks_nested_directories(self, tmp_path):
+        from backend import _scan_tree
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "a.txt").write_text("hello")
+        (tmp_path / "nested" / "b.PDF").write_bytes(b"12345678")
+
+        assert sorted((entry.stat().st_size, entry.name) for entry in _scan_tree(str(tmp_path))) == \
+            [(5, "a.txt"), (8, "b.PDF")]
+
+    def test_directory_estimate(self, tmp_path):
+        backend = make_backend()
+        for i in range(3):
+            (tmp_path / f"doc{i}.md").write_text("text")
+
+        assert backend._estimate_processing_time(paths=[str(tmp_path)]) == "1-3 minutes"
+        assert backend._estimate_processing_time(paths=[str(tmp_path / "missing")]) == "30 seconds"
+
+    def test_many_files_bucket(self, tmp_path):
+        backend = make_backend()
+        for i in range(25):
+            (tmp_path / f"doc{i}.pdf").write_bytes(b"%PDF")
+
+        assert backend._estimate_processing_time(paths=[str(tmp_path)]) == "3-8 minutes"
+
+    def test_content_buckets(self):
+        backend = make_backend()
+
+        assert backend._estimate_processing_time(content="x" * 999) == "30-60 seconds"
+        assert backend._estimate_processing_time(content="x" * 1000) == "1-2 minutes"
+        assert backend._estimate_processing_time(content="x" * 5000) == "2-3 minutes"
+
+    def test_tree_stats_cached_until_directory_changes(self, tmp_path):
+        import os
+        from backend import _compute_tree_stats
+        (tmp_path / "a.txt").write_text("hello")
+        os.utime(tmp_path, ns=(1, 1))
+        first = _compute_tree_stats(str(tmp_path), os.stat(tmp_path).st_mtime_ns, 0)
+        hits = _compute_tree_stats.cache_info().hits
+        _compute_tree_stats(str(tmp_path), os.stat(tmp_path).st_mtime_ns, 0)
+
+        (tmp_path / "b.pdf").write_text("pdf")
+        second = _compute_tree_stats(str(tmp_path), os.stat(tmp_path).st_mtime_ns, 0)
+
+        assert _compute_tree_stats.cache_info().hits == hits + 1
+        assert first == (1, 5, False)
+        assert second[0] == 2 and second[2] is True
+
+    def test_clear_estimate_cache_rescans(self, tmp_path):
+        from backend import clear_estimate_cache
+        backend = make_backend()
+        (tmp_path / "a.txt").write_text("hello")
+        assert backend._estimate_processing_time(paths=[str(tmp_path)]) == "30-60 seconds"
+
+        # A change in a nested directory leaves the root mtime alone
+        (tmp_path / "nested").mkdir()
+        root_mtime = tmp_path.stat().st_mtime_ns
+        (tmp_path / "nested" / "b.pdf").write_text("pdf")
+        clear_estimate_cache()
+
+        assert tmp_path.stat().st_mtime_ns == root_mtime
+        assert backend._estimate_processing_time(paths=[str(tmp_path)]) == "2-5 minutes"
+
+class TestProcessingStatus:
+    """Test processing status records"""
+
+    def test_processing_id_skips_ids_in_use(self):
+        from unittest.mock import patch
+        backend = make_backend()
+        backend._update_processing_status("0000beef", "processing", "Working", 10)
+
+        with patch("backend.secrets.token_hex", side_effect=["0000beef", "0000cafe"]):
+            assert backend._create_processing_id() == "0000cafe"
+
+    def test_record_replaced_on_update(self):
+        from backend import PROCESSING_STATUS
+        backend = make_backend()
+        backend._update_processing_status("replace-id", "processing", "Working", 10,
+                                          current_file="a.pdf", total_files=2, files_completed=0)
+        record = PROCESSING_STATUS["replace-id"]
+        started_at = backend.get_processing_status("replace-id")["processing"]["started_at"]
+        backend._update_processing_status("replace-id", "processing", "Still working", 50)
+        processing = backend.get_processing_status("replace-id")["processing"]
+
+        assert PROCESSING_STATUS["replace-id"] is not record
+        assert record["message"] == "Working" and record["current_file"] == "a.pdf"
+        assert processing["started_at"] == started_at
+        assert processing["progress"] == 50
+        assert "current_file" not in processing and "total_files" not in processing
+        assert "updated_at" in processing
+        assert not any(key.startswith("_") for key in processing)
+
+    def test_bulk_file_progress_publishes_once(self):
+        from backend import PROCESSING_STATUS
+        backend = make_backend()
+        paths = ["a.pdf", "b.pdf", "c.pdf"]
+        file_progress = backend._initialize_file_progress("bulk-id", paths)
+        backend._update_processing_status("bulk-id", "processing", "Working", 30,
+                                          total_files=3, file_progress=file_progress)
+        version = PROCESSING_STATUS["bulk-id"]["version"]
+        backend._bulk_update_file_progress("bulk-id", range(3), status="completed", progress=100, phase="completed")
+        record = PROCESSING_STATUS["bulk-id"]
+
+        assert record["version"] == version + 1
+        assert record["individual_files"] is file_progress
+        assert record["files_completed"] == 3
+        assert all(f["status"] == "completed" for f in record["individual_files"])
+
+    def test_completed_counter_tracks_transitions(self):
+        from backend import PROCESSING_STATUS
+        backend = make_backend()
+        paths = ["a.pdf", "b.pdf"]
+        backend._update_processing_status("count-id", "processing", "Working", 30,
+                                          total_files=2, file_progress=backend._initialize_file_progress("count-id", paths))
+        backend._update_file_progress("count-id", 0, status="completed")
+        backend._update_file_progress("count-id", 0, status="completed")
+        backend._update_file_progress("count-id", 1, status="failed")
+
+        assert PROCESSING_STATUS["count-id"]["files_completed"] == 1
+        assert PROCESSING_STATUS["count-id"]["_failed_count"] == 1
+
+    def test_phase_progress_from_weights(self):
+        from backend import PHASE_CUMULATIVE
+
+        assert PHASE_CUMULATIVE == {"docling": 0, "chunking": 20, "kg_extraction": 30, "indexing": 90}
+
+    def test_finished_job_summarized_and_expires_sooner(self):
+        from backend import PROCESSING_STATUS, FINISHED_STATUS_TTL, _status_expiry
+        backend = make_backend()
+        paths = ["a.pdf", "b.pdf"]
+        backend._update_processing_status("done-id", "processing", "Working", 30,
+                                          total_files=2, file_progress=backend._initialize_file_progress("done-id", paths))
+        backend._update_file_progress("done-id", 0, status="completed", progress=100)
+        backend._update_file_progress("done-id", 1, status="failed", error="Docling error")
+        backend._update_processing_status("done-id", "completed", "Done", 100)
+        record = PROCESSING_STATUS["done-id"]
+
+        assert record["files_summary"] == {"completed": 1, "failed": 1, "first_failed": "b.pdf"}
+        assert record["individual_files"][1] == {"index": 1, "filename": "b.pdf", "status": "failed",
+                                                 "progress": 0, "phase": "waiting", "error": "Docling error"}
+        assert _status_expiry("done-id", record, 0) == FINISHED_STATUS_TTL
+
+    def test_batch_marks_unconverted_files_failed(self):
+        from backend import PROCESSING_STATUS
+        backend = make_backend()
+        paths = ["a.pdf", "missing.pdf"]
+
+        async def ingest_documents(file_paths, processing_id=None, status_callback=None, file_callback=None):
+            file_callback(0, True)
+            file_callback(1, False)
+
+        backend._system.ingest_documents = ingest_documents
+        backend._update_processing_status("batch-id", "processing", "Working", 10,
+                                          total_files=2, file_progress=backend._initialize_file_progress("batch-id", paths))
+        asyncio.run(backend._process_files_batch_with_progress("batch-id", paths))
+        files = PROCESSING_STATUS["batch-id"]["individual_files"]
+
+        assert [f["status"] for f in files] == ["completed", "failed"]
+        assert PROCESSING_STATUS["batch-id"]["files_completed"] == 1
+
+    def test_repository_ingest_dispatch(self):
+        from backend import PROCESSING_STATUS, IngestJob
+        backend = make_backend()
+        backend._system.ingest_alfresco = AsyncMock()
+        config = {"url": "http://localhost:8080/alfresco", "path": "/Shared"}
+        backend._update_processing_status("repo-id", "started", "Starting", 0)
+
+        asyncio.run(backend._process_documents_async("repo-id", IngestJob("alfresco", alfresco_config=config)))
+
+        backend._system.ingest_alfresco.assert_awaited_once_with(
+            config, processing_id="repo-id", status_callback=backend._update_processing_status)
+        assert PROCESSING_STATUS["repo-id"]["status"] == "completed"
+        assert "Alfresco" in PROCESSING_STATUS["repo-id"]["message"]
+
+    def test_repository_ingest_reports_connecting_first(self):
+        from backend import IngestJob
+        backend = make_backend()
+        backend._system.ingest_cmis = AsyncMock()
+        backend._update_processing_status("cmis-id", "started", "Starting", 0)
+        messages = []
+        update = backend._update_processing_status
+        backend._update_processing_status = lambda pid, status, message, *args, **kwargs: (
+            messages.append(message), update(pid, status, message, *args, **kwargs))
+
+        asyncio.run(backend._process_documents_async("cmis-id", IngestJob("cmis", cmis_config={})))
+
+        assert messages[0] == "Connecting to CMIS repository..."
+        assert len(messages) == 2
+
+    def test_cancelled_batch_is_cleaned_up_not_failed(self):
+        from backend import PROCESSING_STATUS, IngestJob
+        backend = make_backend()
+        backend._cleanup_partial_processing = AsyncMock()
+        backend._update_processing_status("stop-id", "started", "Starting", 0)
+
+        async def ingest_documents(file_paths, processing_id=None, **kwargs):
+            backend.cancel_processing(processing_id)
+            raise RuntimeError("Processing cancelled by user")
+
+        backend._system.ingest_documents = ingest_documents
+
+        async def run():
+            await backend._process_documents_async("stop-id", IngestJob("filesystem", paths=["a.pdf", "b.pdf"]))
+            await backend.shutdown()
+
+        asyncio.run(run())
+
+        assert PROCESSING_STATUS["stop-id"]["status"] == "cancelled"
+        assert all(f["status"] != "failed" for f in PROCESSING_STATUS["stop-id"]["individual_files"])
+        backend._cleanup_partial_processing.assert_awaited_once_with("stop-id")
+
+    def test_cancel_cleanup_runs_once_in_background(self):
+        backend = make_backend()
+        backend._cleanup_partial_processing = AsyncMock()
+        backend._update_processing_status("cleanup-id", "cancelled", "Processing cancelled by user", 40)
+
+        async def schedule_twice():
+            backend._schedule_cleanup("cleanup-id")
+            backend._schedule_cleanup("cleanup-id")
+            await backend.shutdown()
+
+        asyncio.run(schedule_twice())
+
+        backend._cleanup_partial_processing.assert_awaited_once_with("cleanup-id")
+        assert not backend._cleanup_tasks
+
+    def test_ingestion_task_held_until_done(self):
+        backend = make_backend()
+        backend._system.ingest_text = AsyncMock()
+
+        async def ingest():
+            await backend.ingest_text("Paul Atreides", "dune.txt")
+            pending = set(backend._background_tasks)
+            await asyncio.gather(*pending)
+            return pending
+
+        assert len(asyncio.run(ingest())) == 1
+        assert not backend._background_tasks
@@ -65,10 +65,47 @@ def test_persistence_config():
     assert config.vector_persist_dir == "/tmp/vector"
     assert config.graph_persist_dir == "/tmp/graph"
 
+def test_shared_embedding_model():
+    """Test that identical provider configs share one embedding model"""
+    from config import LLMProvider
+    from factories import LLMFactory
+    
+    config = {"embedding_model": "nomic-embed-text", "base_url": "http://localhost:11434"}
+    first = LLMFactory.get_shared_embedding_model(LLMProvider.OLLAMA, config)
+    
+    assert LLMFactory.get_shared_embedding_model("ollama", dict(config)) is first
+    assert LLMFactory.get_shared_embedding_model(LLMProvider.OLLAMA, {**config, "embedding_model": "all-minilm"}) is not first
+
+def test_copy_stream_reuses_buffer():
+    """Test that repository downloads are copied through a small reusable buffer"""
+    import io
+    from sources import copy_stream
+    
+    buffer = bytearray(4)
+    sink = io.BytesIO()
+    assert copy_stream(io.BytesIO(b"0123456789"), sink, buffer) == 10
+    assert sink.getvalue() == b"0123456789"
+
+def test_named_schema_lookup():
+    """Test that named schemas are found by name, first definition first"""
+    from config import Settings
+    
+    config = Settings(schema_name="dune", schemas=[
+        {"name": "dune", "schema": {"entities": ["PERSON"]}},
+        {"name": "dune", "schema": {"entities": ["PLANET"]}},
+    ])
+    
+    assert config.get_active_schema() == {"entities": ["PERSON"]}
+    config.schema_name = "missing"
+    assert config.get_active_schema() is None
+
 if __name__ == "__main__":
     # Run basic tests
     test_imports()
     test_basic_configuration()
     test_search_db_types()
     test_persistence_config()
+    test_shared_embedding_model()
+    test_copy_stream_reuses_buffer()
+    test_named_schema_lookup()
     print("All basic tests passed!") 
\ No newline at end of file
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the CMISHandler download/processing pipeline
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the flexible-graphrag directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "flexible-graphrag"))
+
+from cmis_util import CMISHandler
+
+class FakeDocument:
+    """Listed CMIS document - only the properties the handler reads"""
+
+    def __init__(self, doc_id: str, content: bytes):
+        self.properties = {
+            'cmis:objectId': doc_id,
+            'cmis:name': f"{doc_id}.pdf",
+            'cmis:contentStreamLength': len(content),
+        }
+
+class FakeRepository:
+    """Repository serving fixed content per object id, recording download order"""
+
+    def __init__(self, contents, delay: float = 0):
+        self.contents = contents
+        self.delay = delay
+        self.downloaded = []
+
+    def getObject(self, doc_id):
+        repo = self
+
+        class _Object:
+            def getContentStream(self):
+                time.sleep(repo.delay)
+                repo.downloaded.append(doc_id)
+                return io.BytesIO(repo.contents[doc_id])
+
+        return _Object()
+
+def make_handler(contents, delay: float = 0) -> CMISHandler:
+    """Create a handler around a fake repository"""
+    return CMISHandler("http://cmis", "admin", "admin", repo=FakeRepository(contents, delay))
+
+def make_documents(count: int):
+    contents = {f"doc{i}": b"PDF content %d" % i for i in range(count)}
+    return contents, [FakeDocument(doc_id, content) for doc_id, content in contents.items()]
+
+class TestPipeline:
+    """Test CMISHandler.process_documents"""
+
+    def test_single_worker_keeps_listing_order(self):
+        contents, documents = make_documents(5)
+        handler = make_handler(contents)
+        seen = []
+
+        async def callback(doc_id, doc_name, content):
+            with open(content, 'rb') as f:
+                assert f.read() == contents[doc_id]
+            seen.append(doc_id)
+
+        asyncio.run(handler.process_documents(documents, callback, concurrency=1))
+
+        assert seen == list(contents)
+        assert handler.repo.downloaded == list(contents)
+
+    def test_concurrent_workers_process_every_document_once(self):
+        contents, documents = make_documents(8)
+        handler = make_handler(contents)
+        seen = []
+        running = 0
+        peak = 0
+
+        async def callback(doc_id, doc_name, content):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            seen.append(doc_id)
+
+        asyncio.run(handler.process_documents(documents, callback, concurrency=3))
+
+        assert sorted(seen) == sorted(contents)
+        assert handler.repo.downloaded == list(contents)
+        assert 1 < peak <= 3
+
+    def test_worker_error_skips_only_that_document(self):
+        contents, documents = make_documents(4)
+        handler = make_handler(contents)
+        paths = []
+        seen = []
+
+        async def callback(doc_id, doc_name, content):
+            paths.append(content)
+            if doc_id == "doc1":
+                raise ValueError("conversion failed")
+            seen.append(doc_id)
+
+        asyncio.run(handler.process_documents(documents, callback, concurrency=2))
+
+        assert sorted(seen) == ["doc0", "doc2", "doc3"]
+        assert not any(os.path.exists(path) for path in paths)
+        assert not handler._claimed_digests
+        # The failed document was not recorded as processed, so a rerun retries it
+        assert len(handler._seen_digests) == 3
+
+    def test_duplicate_content_is_processed_once(self):
+        contents = {"doc0": b"same", "doc1": b"same", "doc2": b"other"}
+        handler = make_handler(contents)
+        seen = []
+
+        async def callback(doc_id, doc_name, content):
+            seen.append(doc_id)
+
+        documents = [FakeDocument(doc_id, content) for doc_id, content in contents.items()]
+        asyncio.run(handler.process_documents(documents, callback, concurrency=1))
+
+        assert seen == ["doc0", "doc2"]
+
+    def test_small_documents_are_handed_over_in_memory(self):
+        contents = {"small": b"tiny", "large": b"x" * 64, "empty": b""}
+        handler = make_handler(contents)
+        received = {}
+
+        async def callback(doc_id, doc_name, content):
+            received[doc_id] = content if isinstance(content, str) else content.read()
+
+        documents = [FakeDocument(doc_id, content) for doc_id, content in contents.items()]
+        asyncio.run(handler.process_documents(documents, callback, concurrency=1, in_memory_limit=16))
+
+        assert received["small"] == b"tiny"
+        assert received["empty"] == b""
+        assert isinstance(received["large"], str) and not os.path.exists(received["large"])
+
+    def test_zero_limit_keeps_documents_on_disk(self):
+        contents = {"empty": b""}
+        handler = make_handler(contents)
+        received = []
+
+        async def callback(doc_id, doc_name, content):
+            received.append(content)
+
+        asyncio.run(handler.process_documents([FakeDocument("empty", b"")], callback, concurrency=1))
+
+        assert isinstance(received[0], str)
+
+    def test_dedup_file_is_scoped_to_processing_config(self, tmp_path):
+        contents, documents = make_documents(2)
+        dedup_path = str(tmp_path / "dedup.json")
+        seen = []
+
+        async def callback(doc_id, doc_name, content):
+            seen.append(doc_id)
+
+        def run(scope):
+            handler = CMISHandler("http://cmis", "admin", "admin", dedup_path=dedup_path,
+                                  repo=FakeRepository(contents), dedup_scope=scope)
+            asyncio.run(handler.process_documents(documents, callback, concurrency=1))
+
+        run("default|openai|gpt-4o-mini")
+        run("default|openai|gpt-4o-mini")
+        assert seen == ["doc0", "doc1"]
+
+        # A different schema or LLM extracts differently, so unchanged documents are processed again
+        run("default|ollama|llama3.1:8b")
+        assert seen == ["doc0", "doc1", "doc0", "doc1"]
+
+    def test_cancellation_removes_downloads(self, tmp_path, monkeypatch):
+        import tempfile
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        contents, documents = make_documents(10)
+        handler = make_handler(contents, delay=0.02)
+
+        async def callback(doc_id, doc_name, content):
+            await asyncio.sleep(10)
+
+        async def run():
+            task = asyncio.ensure_future(handler.process_documents(documents, callback, concurrency=2))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            # Let a download thread still running at cancellation finish and be discarded
+            await asyncio.sleep(0.1)
+
+        asyncio.run(run())
+
+        assert not list(tmp_path.iterdir())
+        assert not handler._claimed_digests
+        assert not handler._seen_digests
+
+    def test_producer_error_propagates(self):
+        contents, documents = make_documents(2)
+        handler = make_handler(contents)
+
+        def listing():
+            yield from documents
+            raise RuntimeError("listing failed")
+
+        async def callback(doc_id, doc_name, content):
+            pass
+
+        async def run():
+            await asyncio.wait_for(handler.process_documents(listing(), callback, concurrency=2), 5)
+
+        try:
+            asyncio.run(run())
+        except RuntimeError as e:
+            assert "listing failed" in str(e)
+        else:
+            raise AssertionError("producer error was swallowed")
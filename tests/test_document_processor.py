@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent conversion in DocumentProcessor
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the flexible-graphrag directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "flexible-graphrag"))
+
+import document_processor
+from document_processor import DocumentProcessor
+
+class FakeConverter:
+    """Stands in for Docling's DocumentConverter, flagging any use from two threads at once"""
+
+    created = []
+    shared = False
+
+    def __init__(self, *args, **kwargs):
+        self.busy = threading.Lock()
+        FakeConverter.created.append(self)
+
+    def convert(self, source):
+        if not self.busy.acquire(blocking=False):
+            FakeConverter.shared = True
+            raise RuntimeError("converter used by two threads at once")
+        try:
+            name = Path(source).stem
+            # Later files finish first, so completion order differs from input order
+            time.sleep(0.01 * (10 - int(name[len("file"):])))
+            text = f"content of {name}"
+            document = SimpleNamespace(export_to_markdown=lambda: text, export_to_text=lambda: text)
+            return SimpleNamespace(document=document)
+        finally:
+            self.busy.release()
+
+def make_processor(monkeypatch, concurrency: int) -> DocumentProcessor:
+    """Create a processor whose converters are FakeConverters"""
+    FakeConverter.created = []
+    FakeConverter.shared = False
+    monkeypatch.setattr(document_processor, "DocumentConverter", FakeConverter)
+    config = SimpleNamespace(ingest_concurrency=concurrency, docling_timeout=30,
+                             docling_cancel_check_interval=0.01)
+    return DocumentProcessor(config)
+
+class TestConcurrentConversion:
+    """Test DocumentProcessor.process_documents with ingest_concurrency > 1"""
+
+    def test_results_and_callback_indices_follow_input_order(self, tmp_path, monkeypatch):
+        processor = make_processor(monkeypatch, concurrency=4)
+        file_paths = []
+        for i in range(8):
+            path = tmp_path / f"file{i}.pdf"
+            path.write_bytes(b"PDF")
+            file_paths.append(str(path))
+        # A missing file and an unsupported one are skipped but still reported at their index
+        file_paths.insert(3, str(tmp_path / "file3-missing.pdf"))
+        unsupported = tmp_path / "file5.exe"
+        unsupported.write_bytes(b"MZ")
+        file_paths.insert(6, str(unsupported))
+        reported = {}
+
+        def file_callback(file_index, converted):
+            assert file_index not in reported
+            reported[file_index] = converted
+
+        documents = asyncio.run(processor.process_documents(file_paths, file_callback=file_callback))
+
+        assert [doc.metadata["source"] for doc in documents] == [
+            path for path in file_paths if path.endswith(".pdf") and "missing" not in path
+        ]
+        for doc in documents:
+            assert doc.text == f"content of {Path(doc.metadata['source']).stem}"
+        assert reported == {i: i not in (3, 6) for i in range(len(file_paths))}
+        assert not FakeConverter.shared
+        assert 1 < len(FakeConverter.created) <= 4
+
+    def test_single_worker_reuses_one_converter(self, tmp_path, monkeypatch):
+        processor = make_processor(monkeypatch, concurrency=1)
+        file_paths = []
+        for i in range(3):
+            path = tmp_path / f"file{i}.pdf"
+            path.write_bytes(b"PDF")
+            file_paths.append(str(path))
+
+        documents = asyncio.run(processor.process_documents(file_paths))
+
+        assert [doc.metadata["source"] for doc in documents] == file_paths
+        assert len(FakeConverter.created) == 1